@@ -0,0 +1,101 @@
+"""Vendor feed ingest throughput and recommendation latency while feeds land.
+
+Seeds a store with the demo catalog, then ingests CSV feeds of increasing size
+(80% price/spec updates, 10% new panels, 10% deletes) while a reader thread
+keeps issuing recommendation queries against the current snapshot. Replaying
+the whole store from disk is timed for comparison with applying one delta.
+
+Run from the repository root:  python benchmarks/bench_catalog_ingest.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import CLIMATES, COMPANIES, PANEL_TYPES
+from catalog_store import CatalogStore, demo_catalog
+
+FEED_SIZES = [1_000, 10_000, 100_000]
+
+
+def vendor_feed(store, n_rows, rng, prefix):
+    existing = store.snapshot().frame["Panel_ID"].to_numpy()
+    n_new, n_delete = n_rows // 10, n_rows // 10
+    n_update = n_rows - n_new - n_delete
+    ids = np.concatenate([
+        rng.choice(existing, n_update),
+        [f"{prefix}-{i:07d}" for i in range(n_new)],
+        rng.choice(existing, n_delete),
+    ])
+    feed = pd.DataFrame({
+        "Panel_ID": ids,
+        "Op": ["upsert"] * (n_update + n_new) + ["delete"] * n_delete,
+        "Company": rng.choice(COMPANIES, n_rows),
+        "Panel_Type": rng.choice(PANEL_TYPES, n_rows),
+        "Efficiency (%)": rng.uniform(14, 22, n_rows).round(2),
+        "Power_Output (W)": rng.integers(250, 500, n_rows),
+        "Lifespan (years)": rng.integers(20, 30, n_rows),
+        "Warranty (years)": rng.integers(10, 25, n_rows),
+        "Cost (₹)": rng.integers(10000, 50000, n_rows),
+        "Best_Climate": rng.choice(CLIMATES, n_rows),
+    })
+    return feed.sample(frac=1, random_state=0)
+
+
+def query_latencies(store, stop, latencies, rng):
+    while not stop.is_set():
+        query = (int(rng.integers(10000, 50000)), rng.choice(CLIMATES), rng.choice(PANEL_TYPES))
+        start = time.perf_counter()
+        store.snapshot().recommend(*query)
+        latencies.append(time.perf_counter() - start)
+
+
+def percentiles(latencies):
+    p50, p99 = np.percentile(np.array(latencies) * 1e3, [50, 99])
+    return f"{p50:>8.3f} {p99:>8.3f}"
+
+
+def main():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as root:
+        store = CatalogStore(root)
+        store.ingest_frame(demo_catalog())
+
+        idle = []
+        stop = threading.Event()
+        reader = threading.Thread(target=query_latencies, args=(store, stop, idle, np.random.default_rng(1)))
+        reader.start()
+        time.sleep(1)
+        stop.set()
+        reader.join()
+        print(f"idle queries: {len(idle):,}  p50/p99 (ms) {percentiles(idle)}")
+
+        print(f"{'feed rows':>10} {'ingest (s)':>11} {'rows/s':>10} {'live panels':>12} "
+              f"{'p50 (ms)':>8} {'p99 (ms)':>8}  (queries during ingest)")
+        for n_rows in FEED_SIZES:
+            path = os.path.join(root, f"feed_{n_rows}.csv")
+            vendor_feed(store, n_rows, rng, f"V{n_rows}").to_csv(path, index=False)
+
+            busy = []
+            stop = threading.Event()
+            reader = threading.Thread(target=query_latencies, args=(store, stop, busy, np.random.default_rng(2)))
+            reader.start()
+            stats, _ = store.ingest(path)
+            stop.set()
+            reader.join()
+            print(f"{n_rows:>10,} {stats['seconds']:>11.3f} {n_rows / stats['seconds']:>10,.0f} "
+                  f"{len(store.snapshot()):>12,} {percentiles(busy)}")
+
+        start = time.perf_counter()
+        replayed = CatalogStore(root)
+        print(f"full replay of {len(replayed._segments)} segments ({len(replayed.snapshot()):,} panels): "
+              f"{time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
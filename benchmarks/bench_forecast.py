@@ -0,0 +1,57 @@
+"""Fleet forecast latency, with a consistency check on the cleaning schedule.
+
+Scores sites x days trajectories of increasing size with and without a
+cleaning schedule. A scheduled forecast must match the unscheduled one until
+the first scheduled clean (in particular on day 0, the site's current state),
+and a mismatch aborts the run.
+
+Run from the repository root:  python benchmarks/bench_forecast.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from efficiency_forecast import forecast_efficiency
+from efficiency_model import load_model
+
+FLEET_SIZES = [1, 100, 1_000, 10_000]
+HORIZON = 30
+CLEANING_INTERVAL = 7
+
+
+def fleet(n_sites, rng):
+    return pd.DataFrame({
+        "Dust_Level": rng.choice(["Low", "Medium", "High"], n_sites),
+        "Days_Since_Cleaning": rng.integers(0, 31, n_sites),
+        "Panel_Age (years)": rng.integers(0, 11, n_sites),
+    })
+
+
+def main():
+    model, feature_columns = load_model()
+    rng = np.random.default_rng(0)
+    start_date = pd.Timestamp("2024-06-01")
+
+    print(f"{'sites':>7} {'rows':>10} {'unscheduled (ms)':>17} {'scheduled (ms)':>15}")
+    for n_sites in FLEET_SIZES:
+        sites = fleet(n_sites, rng)
+        start = time.perf_counter()
+        unscheduled, _ = forecast_efficiency(model, feature_columns, sites, HORIZON, start_date)
+        mid = time.perf_counter()
+        scheduled, _ = forecast_efficiency(model, feature_columns, sites, HORIZON, start_date,
+                                           cleaning_interval=CLEANING_INTERVAL)
+        end = time.perf_counter()
+
+        before_first_clean = unscheduled.columns[:CLEANING_INTERVAL]
+        if not np.allclose(scheduled[before_first_clean], unscheduled[before_first_clean]):
+            sys.exit("scheduled forecast diverges from the site's current state before the first clean")
+        print(f"{n_sites:>7,} {n_sites * HORIZON:>10,} {(mid - start) * 1e3:>17.1f} {(end - mid) * 1e3:>15.1f}")
+    print(f"scheduled forecasts match the unscheduled ones until day {CLEANING_INTERVAL}")
+
+
+if __name__ == "__main__":
+    main()
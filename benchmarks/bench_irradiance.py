@@ -0,0 +1,49 @@
+"""Time to compute a year of hourly plane-of-array irradiance for one site.
+
+Run from the repository root:  python benchmarks/bench_irradiance.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from irradiance import _cached_plane_of_array, annual_irradiance, plane_of_array
+
+REPEATS = 50
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def main():
+    rng = np.random.default_rng(0)
+    sites = [(rng.uniform(8, 35), rng.uniform(68, 97)) for _ in range(REPEATS)]
+
+    print(f"{'compute (8760 h)':<28} {best_of(lambda: plane_of_array(28.61, 77.21, 25, 180)):>8.2f} ms")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        site = iter(sites)
+        cold = best_of(lambda: annual_irradiance(*next(site), 25, 180, cache_dir=cache_dir))
+        _cached_plane_of_array.cache_clear()
+        site = iter(sites)
+        disk = best_of(lambda: annual_irradiance(*next(site), 25, 180, cache_dir=cache_dir))
+        memory = best_of(lambda: annual_irradiance(*sites[0], 25, 180, cache_dir=cache_dir))
+        cell_bytes = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+
+    print(f"{'compute + store grid cell':<28} {cold:>8.2f} ms")
+    print(f"{'load from disk cache':<28} {disk:>8.2f} ms")
+    print(f"{'in-memory cache hit':<28} {memory:>8.3f} ms")
+    print(f"{'bytes per grid cell':<28} {cell_bytes:>8,}")
+
+
+if __name__ == "__main__":
+    main()
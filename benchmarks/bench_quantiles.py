@@ -0,0 +1,59 @@
+"""Latency of point-only vs point + quantile scoring on the batch path.
+
+Run from the repository root:  python benchmarks/bench_quantiles.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from efficiency_model import (
+    build_features,
+    load_model,
+    load_quantile_model,
+    predict_efficiency,
+    predict_with_quantiles,
+)
+
+BATCH_SIZES = [1, 100, 10_000, 100_000]
+REPEATS = 5
+
+
+def random_readings(n, rng):
+    return (
+        rng.uniform(15, 45, n),
+        rng.uniform(20, 95, n),
+        rng.choice(["Low", "Medium", "High"], n, p=[0.6, 0.3, 0.1]),
+        rng.integers(1, 31, n),
+        rng.integers(0, 11, n),
+    )
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    model, feature_columns = load_model()
+    quantile_model = load_quantile_model()
+    if quantile_model is None:
+        sys.exit("Quantile model not found - run pages/train_and_save_model.py first")
+
+    rng = np.random.default_rng(0)
+    print(f"{'batch':>8} {'point (ms)':>12} {'+quantiles (ms)':>16} {'overhead':>9}")
+    for n in BATCH_SIZES:
+        X = build_features(*random_readings(n, rng), feature_columns)
+        point = best_of(lambda: predict_efficiency(model, feature_columns, X))
+        both = best_of(lambda: predict_with_quantiles(model, quantile_model, feature_columns, X))
+        print(f"{n:>8} {point * 1e3:>12.2f} {both * 1e3:>16.2f} {both / point:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
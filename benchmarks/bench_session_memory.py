@@ -0,0 +1,98 @@
+"""Resident memory per session for the recommendation page's session state.
+
+Simulates many concurrent sessions in one process, first holding what the page
+used to keep per session (the recommended rows as a DataFrame plus booking
+flags), then what it keeps now (the query tuple and a PanelSelection, with the
+row IDs from a catalog snapshot held by the session memory accountant). Each
+layout runs in its own subprocess so RSS measurements don't interfere.
+
+Run from the repository root:  python benchmarks/bench_session_memory.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+N_SESSIONS = 1_000
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+def queries(df, n):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    budgets = rng.integers(5_000, 200_000, n)
+    climates = rng.choice(df["Best_Climate"].unique(), n)
+    types = rng.choice(df["Panel_Type"].unique(), n)
+    return list(zip(budgets.tolist(), climates.tolist(), types.tolist()))
+
+
+def run(layout):
+    import gc
+
+    from catalog import PanelSelection
+    from catalog_store import CatalogStore, demo_catalog
+    from session_memory import SessionMemoryAccountant
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CatalogStore(root)
+        store.ingest_frame(demo_catalog())
+    snapshot = store.snapshot()
+    df = snapshot.frame
+    session_queries = queries(df, N_SESSIONS)
+    accountant = SessionMemoryAccountant(budget_bytes=float("inf"))
+
+    gc.collect()
+    before = rss_bytes()
+    sessions = []
+    for i, (budget, climate, preferred_type) in enumerate(session_queries):
+        if layout == "dataframe":
+            suitable = df[(df["Cost (₹)"] <= budget) & (df["Best_Climate"] == climate) & (df["Panel_Type"] == preferred_type)]
+            if suitable.empty:
+                suitable = df[(df["Cost (₹)"] <= budget) & (df["Panel_Type"] == preferred_type)]
+            if suitable.empty:
+                suitable = df[df["Cost (₹)"] <= budget]
+            top = suitable.sort_values("Efficiency (%)", ascending=False).head(3)
+            state = {
+                "recommendations": top,
+                "selected_panel": top["Panel_Type"].iloc[0] if len(top) else None,
+                "selected_company": top["Company"].iloc[0] if len(top) else None,
+                "show_payment": False,
+            }
+        else:
+            ids = snapshot.recommend(budget, climate, preferred_type)
+            accountant.put(str(i), "recommendation_ids", ids)
+            row = df.loc[ids[0]] if len(ids) else None
+            state = {
+                "recommendation_query": (budget, climate, preferred_type),
+                "selection": PanelSelection(row["Company"], row["Panel_Type"]) if row is not None else None,
+                "show_payment": False,
+            }
+        accountant.observe_state(str(i), state)
+        sessions.append(state)
+    gc.collect()
+    after = rss_bytes()
+
+    report = accountant.report()
+    accounted = (report["State Bytes"] + report["Derived Bytes"]).mean()
+    print(f"{layout:>10} {N_SESSIONS:>9,} {(after - before) / N_SESSIONS:>14,.0f} {accounted:>18,.0f}")
+
+
+def main():
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+        return
+    print(f"{'layout':>10} {'sessions':>9} {'RSS/session (B)':>14} {'accounted/session (B)':>18}")
+    for layout in ["dataframe", "compact"]:
+        subprocess.run([sys.executable, os.path.abspath(__file__), layout], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Catalog index build time and sizing-query latency as the catalog grows.
+
+Run from the repository root:  python benchmarks/bench_sizing.py
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog import generate_solar_panel_data
+from sizing import build_catalog_index, optimize_system
+
+CATALOG_SIZES = [20_000, 80_000, 320_000, 1_280_000]
+# Up to the page's ₹5M budget limit, where the budget dimension is largest
+QUERIES = [(10, 200_000, "Hot"), (25, 500_000, "Cloudy"), (5, 50_000, "Temperate"),
+           (10, 5_000_000, "Hot"), (200, 5_000_000, "Cloudy")]
+REPEATS = 5
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1e3
+
+
+def main():
+    print(f"{'catalog rows':>12} {'index (ms)':>11} {'front size':>11} " + " ".join(
+        f"{f'{kwh} kWh/₹{budget // 1000}k (ms)':>22}" for kwh, budget, _ in QUERIES
+    ))
+    for n_rows in CATALOG_SIZES:
+        catalog = generate_solar_panel_data(n_rows)
+        index_ms = best_of(lambda: build_catalog_index(catalog))
+        index = build_catalog_index(catalog)
+        front_size = max(len(front.rows) for front in index.values())
+        query_ms = [
+            best_of(lambda: optimize_system(catalog, index, kwh, budget, climate))
+            for kwh, budget, climate in QUERIES
+        ]
+        print(f"{n_rows:>12,} {index_ms:>11.1f} {front_size:>11} " + " ".join(f"{ms:>22.1f}" for ms in query_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Scoring latency of the distilled surrogate against the full ensemble.
+
+Times both engines on batches from a single reading up to a million, checks
+that serving the surrogate never imports xgboost (in a fresh interpreter),
+and reports the artifact size and held-out accuracy recorded at distillation.
+
+Run from the repository root:  python benchmarks/bench_surrogate.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from surrogate import surrogate_for, surrogate_path
+
+BATCH_SIZES = [1, 100, 10_000, 1_000_000]
+NUMPY_ONLY_CHECK = """
+import sys
+sys.path.insert(0, {root!r})
+from surrogate import Surrogate
+Surrogate.load({path!r}).predict(25.0, 60.0, "Medium", 7, 3)
+print("xgboost" in sys.modules)
+"""
+
+
+def readings(n, rng):
+    return (
+        rng.uniform(15, 45, n),
+        rng.uniform(20, 95, n),
+        rng.choice(["Low", "Medium", "High"], n),
+        rng.integers(1, 31, n),
+        rng.integers(0, 11, n),
+    )
+
+
+def best_of(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    from efficiency_model import build_features, load_model, predict_efficiency
+    from model_registry import latest_model_path, latest_version
+
+    path = latest_model_path()
+    surrogate = surrogate_for(path, latest_version())
+    if surrogate is None:
+        sys.exit(f"no surrogate distilled from {path}; run python surrogate.py")
+    model, feature_columns = load_model(path)
+    rng = np.random.default_rng(0)
+
+    print(f"{'rows':>10} {'ensemble (ms)':>14} {'surrogate (ms)':>15} {'speedup':>8} {'max |diff| (%)':>15}")
+    for n in BATCH_SIZES:
+        inputs = readings(n, rng)
+        repeats = max(3, 1000 // n)
+        ensemble = best_of(lambda: predict_efficiency(model, feature_columns, build_features(*inputs, feature_columns)),
+                           repeats)
+        fast = best_of(lambda: surrogate.predict(*inputs), repeats)
+        diff = np.abs(surrogate.predict(*inputs)
+                      - predict_efficiency(model, feature_columns, build_features(*inputs, feature_columns))).max()
+        print(f"{n:>10,} {ensemble * 1e3:>14.3f} {fast * 1e3:>15.3f} {ensemble / fast:>7.1f}x {diff:>15.2f}")
+
+    check = NUMPY_ONLY_CHECK.format(root=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    path=os.path.abspath(surrogate_path(path)))
+    imported = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+    print(f"xgboost imported when serving the surrogate: {imported.stdout.strip()}")
+    print(f"artifact: {surrogate_path(path)} ({os.path.getsize(surrogate_path(path)):,} bytes, "
+          f"{len(surrogate.terms)} terms) vs model {os.path.getsize(path):,} bytes")
+    for name, metrics in surrogate.metrics.items():
+        print(f"  {name.replace('_', ' '):<24} MAE {metrics['mae']:.3f}  max {metrics['max_abs']:.3f}  "
+              f"R² {metrics['r2']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Throughput of the streaming telemetry pipeline on one core.
+
+Run from the repository root:  python benchmarks/bench_telemetry.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from efficiency_model import load_model
+from telemetry_stream import TelemetryMonitor, model_scorer, read_telemetry, reference_histograms
+
+N_READINGS = 500_000
+N_SITES = 5_000
+
+
+def write_stream(path, rng):
+    pd.DataFrame({
+        "Site_ID": rng.integers(0, N_SITES, N_READINGS),
+        "Temperature (°C)": rng.uniform(15, 45, N_READINGS).round(1),
+        "Humidity (%)": rng.uniform(20, 95, N_READINGS).round(1),
+        "Dust_Level": rng.choice(["Low", "Medium", "High"], N_READINGS, p=[0.6, 0.3, 0.1]),
+        "Days_Since_Cleaning": rng.integers(1, 31, N_READINGS),
+        "Panel_Age (years)": rng.integers(0, 11, N_READINGS),
+        "Efficiency (%)": rng.normal(82, 4, N_READINGS).round(2),
+    }).to_csv(path, index=False)
+
+
+def throughput(monitor, path):
+    start = time.perf_counter()
+    monitor.run(read_telemetry([path]))
+    return monitor.readings / (time.perf_counter() - start)
+
+
+def main():
+    model, feature_columns = load_model()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "telemetry.csv")
+        write_stream(path, np.random.default_rng(0))
+
+        scorers = {
+            "ingest + aggregates (constant scorer)": lambda X: np.full(len(X), 85.0, dtype=np.float32),
+            "ingest + aggregates + XGBoost scoring": model_scorer(model, feature_columns),
+        }
+        for name, scorer in scorers.items():
+            monitor = TelemetryMonitor(feature_columns, scorer, reference_histograms())
+            rate = throughput(monitor, path)
+            print(f"{name:<40} {rate:>12,.0f} readings/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""Concurrent-session load test for the Streamlit pages.
+
+Drives many simulated sessions with Streamlit's AppTest inside one process,
+so cached resources (models, catalog store, irradiance cache) are shared the
+same way they are on a server. Each session follows a scripted flow:
+
+    home            estimate savings for a random site
+    recommendation  get recommendations, open a panel booking, submit the form
+    predictor       submit the efficiency form with random conditions
+    subsidy         pick a state and tick the eligibility checklist
+    login           complete the Google OAuth callback
+
+SMTP, Twilio, the Lottie and OAuth endpoints, webbrowser and os.system are
+replaced by local stand-ins, and the pages run in a scratch directory, so no
+mail, call, browser, process or booking record leaves the test. Reports
+throughput, latency percentiles per page step and resident memory growth.
+
+Run from the repository root (benchmarks/requirements.txt installs the
+Streamlit release it is tested against):
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/loadtest.py --sessions 200 --concurrency 32
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import streamlit as st  # noqa: E402
+
+# shared_runtime() patches Streamlit internals (Runtime._instance, app_test module
+# globals, the component manager) that can move between releases
+TESTED_STREAMLIT = ["1.66"]  # Minor releases the harness has been run against
+if ".".join(st.__version__.split(".")[:2]) not in TESTED_STREAMLIT:
+    print(f"⚠️ loadtest.py is tested with Streamlit {', '.join(v + '.x' for v in TESTED_STREAMLIT)}, found "
+          f"{st.__version__}; if the run fails, pip install -r benchmarks/requirements.txt or update "
+          "shared_runtime()", file=sys.stderr)
+
+from streamlit.components.v2.component_manager import BidiComponentManager  # noqa: E402
+from streamlit.runtime import Runtime  # noqa: E402
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager  # noqa: E402
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager  # noqa: E402
+from streamlit.runtime.media_file_manager import MediaFileManager  # noqa: E402
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage  # noqa: E402
+from streamlit.runtime.pages_manager import PagesManager  # noqa: E402
+from streamlit.runtime.scriptrunner import get_script_run_ctx  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.runtime.secrets import Secrets  # noqa: E402
+from streamlit.testing.v1 import AppTest, app_test  # noqa: E402
+
+import session_memory  # noqa: E402
+
+# (main script, page) per flow; pages are reached through the multipage app as on a server
+PAGES = {
+    "home": ("home.py", None),
+    "recommendation": ("home.py", "pages/recommendation.py"),
+    "predictor": ("home.py", "pages/efficiency_predictor.py"),
+    "subsidy": ("home.py", "pages/subsidy.py"),
+    "login": ("app.py", None),
+}
+SECRETS = {
+    "TWILIO_ACCOUNT_SID": "ACloadtest",
+    "TWILIO_AUTH_TOKEN": "loadtest",
+    "TWILIO_PHONE_NUMBER": "+10000000000",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": 587,
+    "SENDER_EMAIL": "loadtest@example.com",
+    "SENDER_PASSWORD": "loadtest",
+}
+PAGE_TIMEOUT = 300
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE
+
+
+# -----------------------------
+# LOCAL STAND-INS
+# -----------------------------
+
+class StandIns:
+    """Counts what the pages tried to send instead of sending it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = defaultdict(int)
+
+    def count(self, name):
+        with self.lock:
+            self.calls[name] += 1
+
+    def http_response(self, url):
+        response = mock.Mock(status_code=200)
+        if "oauth2.googleapis.com/token" in url:
+            response.json.return_value = {"access_token": "loadtest-token"}
+        elif "userinfo" in url:
+            response.json.return_value = {"name": "Load Test", "email": "loadtest@example.com"}
+        else:
+            response.json.return_value = {}  # Lottie animation JSON
+        return response
+
+    def get(self, url, *args, **kwargs):
+        self.count("http")
+        return self.http_response(url)
+
+    def post(self, url, *args, **kwargs):
+        self.count("http")
+        return self.http_response(url)
+
+    def smtp(self, *args, **kwargs):
+        stand_ins = self
+
+        class SMTP:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def starttls(self):
+                pass
+
+            def login(self, *credentials):
+                pass
+
+            def send_message(self, message):
+                stand_ins.count("email")
+
+        return SMTP()
+
+    def session_id(self):
+        # AppTest gives every app the same session ID; the state behind each
+        # run's SafeSessionState wrapper is what persists per app
+        return f"loadtest-{id(get_script_run_ctx().session_state._state):x}"
+
+    def twilio_client(self, *args, **kwargs):
+        client = mock.Mock()
+        client.calls.create.side_effect = lambda **call: self.count("call") or mock.Mock(sid="CAloadtest")
+        return client
+
+    @contextlib.contextmanager
+    def installed(self):
+        with contextlib.ExitStack() as stack:
+            for target, replacement in [
+                ("requests.get", self.get),
+                ("requests.post", self.post),
+                ("smtplib.SMTP", self.smtp),
+                ("smtplib.SMTP_SSL", self.smtp),
+                ("twilio.rest.Client", self.twilio_client),
+                ("webbrowser.open", lambda *args, **kwargs: self.count("browser")),
+                ("os.system", lambda *args, **kwargs: self.count("system") or 0),
+                ("session_memory.current_session_id", self.session_id),
+            ]:
+                stack.enter_context(mock.patch(target, replacement))
+            yield
+
+
+@contextlib.contextmanager
+def shared_runtime():
+    """One runtime, set of secrets and config for every simulated session.
+
+    AppTest installs and tears these process globals down around each run,
+    which races once sessions run on several threads. A server process sets
+    them up once, so the load test does the same and points AppTest's per-run
+    copies at throwaway subclasses. Every main script sits next to pages/, so
+    the multipage flag is fixed for the whole test.
+    """
+    runtime = mock.MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    secrets = Secrets()
+    secrets._secrets = dict(SECRETS)
+    script_cache = ScriptCache()  # Compile each page once, as a server does
+
+    class PerRunRuntime(Runtime):
+        pass
+
+    class PerRunPagesManager(PagesManager):
+        pass
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.object(Runtime, "_instance", runtime))
+        stack.enter_context(mock.patch.object(app_test, "Runtime", PerRunRuntime))
+        stack.enter_context(mock.patch.object(app_test, "ScriptCache", lambda: script_cache))
+        stack.enter_context(mock.patch.object(PagesManager, "uses_pages_directory", True))
+        stack.enter_context(mock.patch.object(app_test, "PagesManager", PerRunPagesManager))
+        stack.enter_context(mock.patch.object(st, "secrets", secrets))
+        stack.enter_context(app_test.patch_config_options({"global.appTest": True}))
+        stack.enter_context(mock.patch.object(app_test, "patch_config_options", lambda options: contextlib.nullcontext()))
+        yield
+
+
+# -----------------------------
+# SESSION FLOWS
+# -----------------------------
+
+class Session:
+    """One simulated user; times every script run under `page:step`."""
+
+    def __init__(self, page, rng, timings):
+        self.page = page
+        self.rng = rng
+        self.timings = timings
+        main_script, page_path = PAGES[page]
+        self.at = AppTest.from_file(os.path.join(ROOT, main_script), default_timeout=PAGE_TIMEOUT)
+        if page_path is not None:
+            self.at.switch_page(page_path)
+
+    def run(self, step, action=None):
+        start = time.perf_counter()
+        (action or self.at).run()
+        elapsed = time.perf_counter() - start
+        self.timings[f"{self.page}:{step}"].append(elapsed)
+        if self.at.exception:
+            raise RuntimeError(f"{self.page}:{step}: {self.at.exception[0].message}")
+
+    def button(self, label):
+        for button in self.at.button:
+            if button.label.startswith(label):
+                return button
+        raise RuntimeError(f"{self.page}: no {label!r} button among {[b.label for b in self.at.button]}")
+
+
+def home_flow(session):
+    at, rng = session.at, session.rng
+    session.run("load")
+    inputs = {n.label: n for n in at.number_input}
+    inputs["Daily Electricity Consumption (kWh)"].set_value(float(rng.integers(5, 40)))
+    inputs["Latitude (°)"].set_value(round(rng.uniform(8, 35) / 0.25) * 0.25)
+    inputs["Longitude (°)"].set_value(round(rng.uniform(68, 97) / 0.25) * 0.25)
+    session.run("estimate", session.button("⚡ Estimate Savings").click())
+
+
+def recommendation_flow(session):
+    at, rng = session.at, session.rng
+    session.run("load")
+    at.slider[0].set_value(int(rng.integers(12, 51)) * 1000)  # Nothing is affordable at the ₹10k minimum
+    at.selectbox[0].set_value(rng.choice(["Hot", "Sunny", "Temperate", "Cloudy"]))
+    session.run("recommend", session.button("Get Recommendations").click())
+    session.run("book", session.button("Book").click())
+    session.run("payment")  # Booking flag takes effect on the next rerun
+    for field, value in zip(at.text_input, ["Load Test", "+91 90000 00000", "loadtest@example.com"]):
+        field.input(value)
+    session.run("submit", session.button("Submit Booking Request").click())
+
+
+def predictor_flow(session):
+    at, rng = session.at, session.rng
+    session.run("load")
+    at.number_input[0].set_value(round(float(rng.uniform(15, 45)), 1))
+    at.selectbox[0].set_value(rng.choice(["Low", "Medium", "High"]))
+    session.run("predict", at.button[0].click())
+
+
+def subsidy_flow(session):
+    at, rng = session.at, session.rng
+    session.run("load")
+    at.selectbox[0].set_value(rng.choice(at.selectbox[0].options))
+    session.run("state")
+    for checkbox in at.checkbox:
+        checkbox.check()
+    session.run("eligibility")
+
+
+def login_flow(session):
+    session.at.query_params["code"] = "loadtest-code"
+    session.run("callback")
+
+
+FLOWS = {
+    "home": home_flow,
+    "recommendation": recommendation_flow,
+    "predictor": predictor_flow,
+    "subsidy": subsidy_flow,
+    "login": login_flow,
+}
+
+
+# -----------------------------
+# DRIVER
+# -----------------------------
+
+def sample_memory(stop, samples, interval=0.1):
+    while not stop.wait(interval):
+        samples.append(rss_bytes())
+
+
+def run_load(pages, sessions, concurrency, seed):
+    timings = defaultdict(list)
+    errors = []
+    rng = np.random.default_rng(seed)
+    plan = [(pages[i % len(pages)], int(rng.integers(2**31))) for i in range(sessions)]
+    random.Random(seed).shuffle(plan)
+
+    def simulate(page, session_seed):
+        try:
+            FLOWS[page](Session(page, np.random.default_rng(session_seed), timings))
+        except Exception as e:
+            errors.append(f"{page}: {e!r}")
+
+    # Warm caches with one session per page so the first wave isn't all cold starts
+    for page in pages:
+        simulate(page, seed)
+    warmup = {name: values[:] for name, values in timings.items()}
+    timings.clear()
+
+    samples = []
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_memory, args=(stop, samples), daemon=True)
+    rss_start = rss_bytes()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda job: simulate(*job), plan))
+    wall = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+    rss_end = rss_bytes()
+    return {
+        "timings": timings,
+        "warmup": warmup,
+        "errors": errors,
+        "wall": wall,
+        "rss_start": rss_start,
+        "rss_end": rss_end,
+        "rss_peak": max(samples + [rss_end]),
+    }
+
+
+def report(result, sessions, concurrency, stand_ins):
+    timings = result["timings"]
+    runs = sum(len(values) for values in timings.values())
+    wall = result["wall"]
+    print(f"\n{sessions:,} sessions, {concurrency} concurrent, {wall:.1f}s wall")
+    print(f"throughput: {sessions / wall:.2f} sessions/s, {runs / wall:.1f} script runs/s")
+    print(f"errors: {len(result['errors'])}")
+    for error in result["errors"][:5]:
+        print(f"  {error}")
+
+    print(f"\n{'page:step':<28} {'runs':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'cold (ms)':>10}")
+    for name in sorted(timings):
+        values = np.array(timings[name]) * 1e3
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        cold = result["warmup"].get(name, [np.nan])[0] * 1e3
+        print(f"{name:<28} {len(values):>6} {p50:>9.0f} {p95:>9.0f} {p99:>9.0f} {values.max():>9.0f} {cold:>10.0f}")
+
+    mb = 2**20
+    print(f"\nRSS: {result['rss_start'] / mb:.0f} MB after warm-up → {result['rss_end'] / mb:.0f} MB at end "
+          f"(peak {result['rss_peak'] / mb:.0f} MB, {(result['rss_end'] - result['rss_start']) / sessions / 1024:.1f} KB/session)")
+    accounted = session_memory.accountant.report()
+    print(f"session accountant: {len(accounted):,} sessions, "
+          f"{session_memory.accountant.total_bytes() / 1024:.0f} KB held, "
+          f"{session_memory.accountant.evictions} evictions, {session_memory.accountant.expired} expired")
+    print("stand-ins: " + ", ".join(f"{name} {count}" for name, count in sorted(stand_ins.calls.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200, help="Simulated sessions in total")
+    parser.add_argument("--concurrency", type=int, default=32, help="Sessions running at the same time")
+    parser.add_argument("--pages", default=",".join(FLOWS), help="Comma-separated flows to mix")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    pages = args.pages.split(",")
+
+    # Pages resolve artifacts relative to the working directory; give them a
+    # scratch one so bookings, caches and the catalog store stay out of the repo
+    scratch = tempfile.mkdtemp(prefix="solar-loadtest-")
+    for name in ["pages", "payment.jpg", "models"]:
+        if os.path.exists(os.path.join(ROOT, name)):
+            os.symlink(os.path.join(ROOT, name), os.path.join(scratch, name))
+    os.chdir(scratch)
+
+    stand_ins = StandIns()
+    try:
+        with shared_runtime(), stand_ins.installed(), contextlib.redirect_stdout(io.StringIO()):
+            result = run_load(pages, args.sessions, args.concurrency, args.seed)
+        report(result, args.sessions, args.concurrency, stand_ins)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
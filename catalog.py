@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+COMPANIES = ["Tata Power", "Luminous", "Adani Solar", "Vikram Solar", "Waaree"]
+PANEL_TYPES = ["Monocrystalline", "Polycrystalline", "Thin-film"]
+CLIMATES = ["Hot", "Sunny", "Temperate", "Cloudy"]
+
+
+def generate_solar_panel_data(n_rows=20000, seed=42):
+    np.random.seed(seed)
+
+    data = {
+        "Company": np.random.choice(COMPANIES, n_rows),
+        "Panel_Type": np.random.choice(PANEL_TYPES, n_rows, p=[0.4, 0.4, 0.2]),
+        "Efficiency (%)": np.random.uniform(14, 22, n_rows),
+        "Power_Output (W)": np.random.randint(250, 500, n_rows),
+        "Lifespan (years)": np.random.randint(20, 30, n_rows),
+        "Warranty (years)": np.random.randint(10, 25, n_rows),
+        "Cost (₹)": np.random.randint(10000, 50000, n_rows),
+        "Best_Climate": np.random.choice(CLIMATES, n_rows)
+    }
+
+    return pd.DataFrame(data)
+
+
+class PanelSelection:
+    """Compact record of the panel a user chose to book."""
+    __slots__ = ("company", "panel_type")
+
+    def __init__(self, company, panel_type):
+        self.company = company
+        self.panel_type = panel_type
+
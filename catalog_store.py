@@ -0,0 +1,404 @@
+"""Versioned panel catalog fed by vendor price and spec feeds.
+
+Vendor feeds (CSV or JSON Lines) are parsed in chunks, validated against the
+catalog schema and stored as one immutable delta segment per feed. Each
+segment holds upserts and deletes keyed by Panel_ID. A JSON manifest lists
+the segments and is replaced atomically, so another process either sees a
+feed completely or not at all. Segments merged away by a compaction stay on
+disk for a grace period, so a reader that has just loaded the previous
+manifest can still replay them.
+
+    python catalog_store.py feeds/waaree_prices.csv --vendor Waaree
+    python catalog_store.py feeds/adani.jsonl --vendor "Adani Solar"
+    python catalog_store.py --compact
+
+In memory, rows are append-only: an upsert appends the new row and retires
+the old one. Only the (climate, panel type) groups a delta touches have their
+efficiency ranking rebuilt. Readers work on immutable `CatalogSnapshot`s, so
+they never see a half-applied feed.
+"""
+import argparse
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from catalog import CLIMATES, PANEL_TYPES, generate_solar_panel_data
+
+CATALOG_DIR = "catalog_store"
+MANIFEST_FILE = "MANIFEST"
+KEY = "Panel_ID"
+OP_COLUMN = "Op"  # "upsert" (default) or "delete"
+TEXT_COLUMNS = ["Company", "Panel_Type", "Best_Climate"]
+NUMERIC_RANGES = {
+    "Efficiency (%)": (5.0, 30.0),
+    "Power_Output (W)": (50, 1000),
+    "Lifespan (years)": (5, 50),
+    "Warranty (years)": (1, 40),
+    "Cost (₹)": (1, 10_000_000),
+}
+INTEGER_COLUMNS = ["Power_Output (W)", "Lifespan (years)", "Warranty (years)", "Cost (₹)"]
+SPEC_COLUMNS = [
+    "Company", "Panel_Type", "Efficiency (%)", "Power_Output (W)",
+    "Lifespan (years)", "Warranty (years)", "Cost (₹)", "Best_Climate",
+]
+COMPACT_SEGMENTS = 64  # The CLI compacts once a fresh reader would have to replay more segments
+RETIRED_GRACE_SECONDS = 600  # How long compacted-away segments are kept for readers of the old manifest
+
+
+def demo_catalog():
+    """The synthetic catalog with Panel_IDs, used to seed an empty store."""
+    frame = generate_solar_panel_data()
+    frame.insert(0, KEY, [f"PNL-{i:06d}" for i in range(len(frame))])
+    return frame
+
+
+def read_vendor_feed(source, chunksize=50_000):
+    """Yields DataFrame chunks from a CSV or JSON Lines feed (path or file object)."""
+    name = getattr(source, "name", source)
+    if os.path.splitext(name)[1].lower() in (".json", ".jsonl", ".ndjson"):
+        yield from pd.read_json(source, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize, dtype={KEY: str})
+
+
+def validate_feed(chunk, vendor=None):
+    """Splits a feed chunk into (valid deltas, rejected rows with a Reason)."""
+    chunk = chunk.copy()
+    if vendor is not None:
+        if "Company" not in chunk.columns:
+            chunk["Company"] = vendor
+        chunk["Company"] = chunk["Company"].fillna(vendor)
+    op = chunk[OP_COLUMN].fillna("upsert").astype(str).str.lower() if OP_COLUMN in chunk.columns \
+        else pd.Series("upsert", index=chunk.index)
+
+    reason = pd.Series("", index=chunk.index, dtype=object)
+    if KEY not in chunk.columns:
+        reason[:] = f"missing {KEY} column"
+        return _empty_deltas(), chunk.assign(Reason=reason)
+    chunk[KEY] = chunk[KEY].astype("string").str.strip()
+    reason[chunk[KEY].isna() | (chunk[KEY] == "")] = f"missing {KEY}"
+    reason[(reason == "") & ~op.isin(["upsert", "delete"])] = "unknown Op"
+
+    upsert = (reason == "") & (op == "upsert")
+    for column in SPEC_COLUMNS:
+        if column not in chunk.columns:
+            reason[upsert & (reason == "")] = f"missing {column}"
+    for column, (low, high) in NUMERIC_RANGES.items():
+        if column in chunk.columns:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+            bad = ~chunk[column].between(low, high)
+            reason[upsert & (reason == "") & bad] = f"{column} outside {low}–{high}"
+    for column, allowed in (("Panel_Type", PANEL_TYPES), ("Best_Climate", CLIMATES)):
+        if column in chunk.columns:
+            reason[upsert & (reason == "") & ~chunk[column].isin(allowed)] = f"unknown {column}"
+    if "Company" in chunk.columns:
+        company = chunk["Company"].astype("string").str.strip()
+        reason[upsert & (reason == "") & (company.isna() | (company == ""))] = "missing Company"
+
+    valid = reason == ""
+    deltas = pd.DataFrame({KEY: chunk.loc[valid, KEY].astype(str), "Deleted": (op[valid] == "delete").to_numpy()})
+    upserts = valid & (op == "upsert")
+    for column in SPEC_COLUMNS:
+        values = chunk[column].where(upserts) if column in chunk.columns else pd.Series(np.nan, index=chunk.index)
+        deltas[column] = values[valid].to_numpy()
+    return deltas, chunk.loc[~valid].assign(Reason=reason[~valid])
+
+
+def _empty_deltas():
+    return pd.DataFrame({KEY: pd.Series(dtype=str), "Deleted": pd.Series(dtype=bool),
+                         **{column: pd.Series(dtype=object) for column in SPEC_COLUMNS}})
+
+
+def _rank(rows, efficiency):
+    # Most efficient first; ties keep row order
+    return rows[np.lexsort((rows, -efficiency[rows]))]
+
+
+def _atomic_write(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class CatalogSnapshot:
+    """One consistent, read-only version of the catalog."""
+
+    def __init__(self, version, columns, live, groups):
+        self.version = version
+        self.columns = columns  # Views over the first len(live) rows; never written again
+        self.live = live
+        self.groups = groups  # (climate, panel type) -> live row IDs, most efficient first
+
+    def __len__(self):
+        return int(self.live.sum())
+
+    @functools.cached_property
+    def frame(self):
+        """Live rows as a DataFrame indexed by row ID."""
+        rows = np.flatnonzero(self.live)
+        return pd.DataFrame({column: values[rows] for column, values in self.columns.items()},
+                            index=pd.Index(rows, name="Row"))
+
+    def _top_affordable(self, keys, budget, top_n):
+        cost = self.columns["Cost (₹)"]
+        picks = [rows[cost[rows] <= budget][:top_n] for key in keys if (rows := self.groups.get(key)) is not None]
+        if not picks:
+            return np.empty(0, dtype=np.int64)
+        return _rank(np.concatenate(picks), self.columns["Efficiency (%)"])[:top_n]
+
+    def recommend(self, budget, climate, preferred_type, top_n=3):
+        """Row IDs of the most efficient affordable panels.
+
+        Prefers panels of `preferred_type` rated for `climate`, then any
+        climate, then any affordable panel.
+        """
+        for keys in (
+            [(climate, preferred_type)],
+            [(other, preferred_type) for other in CLIMATES],
+            list(self.groups),
+        ):
+            rows = self._top_affordable(keys, budget, top_n)
+            if len(rows):
+                return rows
+        return rows
+
+
+class CatalogStore:
+    """On-disk catalog applied incrementally from delta segments.
+
+    One process should ingest at a time; any number of processes can read and
+    pick up new feeds with `refresh`.
+    """
+
+    def __init__(self, root=CATALOG_DIR, initial_rows=1024):
+        self.root = root
+        self._lock = threading.Lock()
+        self._retired = {}  # Segment name -> when a compaction retired it
+        self._reset(initial_rows)
+        self.refresh()
+
+    def _reset(self, initial_rows):
+        self._buffers = {KEY: np.empty(initial_rows, dtype=object)}
+        for column in SPEC_COLUMNS:
+            dtype = object if column in TEXT_COLUMNS else np.int64 if column in INTEGER_COLUMNS else np.float64
+            self._buffers[column] = np.empty(initial_rows, dtype=dtype)
+        self._n_rows = 0
+        self._live = np.zeros(0, dtype=bool)
+        self._row_of = {}
+        self._segments = []
+        self._snapshot = CatalogSnapshot(0, self._views(), self._live, {})
+
+    def snapshot(self):
+        return self._snapshot
+
+    def _views(self):
+        return {column: buffer[:self._n_rows] for column, buffer in self._buffers.items()}
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"version": 0, "segments": []}
+
+    def _write_manifest(self, version):
+        # Retired segments past their grace period are dropped from the manifest first,
+        # then deleted, so no manifest ever lists a missing file
+        now = time.time()
+        expired = [name for name, retired_at in self._retired.items() if now - retired_at > RETIRED_GRACE_SECONDS]
+        for name in expired:
+            del self._retired[name]
+        _atomic_write(
+            os.path.join(self.root, MANIFEST_FILE),
+            json.dumps({"version": version, "segments": self._segments, "retired": self._retired}).encode(),
+        )
+        for name in expired:
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def _checkpoint(self):
+        return dict(self._buffers), self._n_rows, self._live, dict(self._row_of), list(self._segments), self._snapshot
+
+    def _restore(self, checkpoint):
+        self._buffers, self._n_rows, self._live, self._row_of, self._segments, self._snapshot = checkpoint
+
+    def refresh(self):
+        """Applies segments published since the last refresh (e.g. by another process)."""
+        try:
+            return self._refresh(self._read_manifest())
+        except FileNotFoundError:
+            # The manifest we read was compacted and its segments purged meanwhile;
+            # the current manifest lists the merged segment instead
+            return self._refresh(self._read_manifest())
+
+    def _refresh(self, manifest):
+        with self._lock:
+            if manifest["version"] == self._snapshot.version:
+                return self._snapshot
+            checkpoint = self._checkpoint()
+            try:
+                if manifest["segments"][:len(self._segments)] != self._segments:
+                    # Compacted elsewhere; replay the new segment list into fresh buffers
+                    self._reset(len(self._buffers[KEY]))
+                groups = dict(self._snapshot.groups)
+                for name in manifest["segments"][len(self._segments):]:
+                    groups, *_ = self._apply(pd.read_parquet(os.path.join(self.root, name)), groups)
+                    self._segments.append(name)
+            except BaseException:
+                # Keep the last complete version; appends past its rows are never visible to it
+                self._restore(checkpoint)
+                raise
+            self._retired = dict(manifest.get("retired", {}))
+            self._snapshot = CatalogSnapshot(manifest["version"], self._views(), self._live, groups)
+        return self._snapshot
+
+    def _grow(self, n_rows):
+        capacity = len(self._buffers[KEY])
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity)
+        for column, buffer in self._buffers.items():
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self._n_rows] = buffer[:self._n_rows]
+            self._buffers[column] = grown  # Old snapshots keep the old buffer
+
+    def _apply(self, deltas, groups):
+        """Appends upserts, retires replaced and deleted rows and re-ranks touched groups.
+
+        Returns (groups, upserts, deletes); `groups` is updated in place.
+        """
+        keys = deltas[KEY].to_numpy()
+        retired = np.array([self._row_of.pop(key) for key in keys if key in self._row_of], dtype=np.int64)
+
+        upserts = deltas[~deltas["Deleted"].to_numpy(dtype=bool)]
+        start, end = self._n_rows, self._n_rows + len(upserts)
+        self._grow(end)
+        for column, buffer in self._buffers.items():
+            buffer[start:end] = upserts[column].to_numpy(dtype=buffer.dtype)
+        self._row_of.update(zip(upserts[KEY].to_numpy(), range(start, end)))
+        self._n_rows = end
+
+        # Copy-on-write: earlier snapshots keep their own live mask
+        live = np.zeros(end, dtype=bool)
+        live[:len(self._live)] = self._live
+        live[retired] = False
+        live[start:end] = True
+        self._live = live
+
+        climate, panel_type = self._buffers["Best_Climate"], self._buffers["Panel_Type"]
+        changed = np.r_[retired, np.arange(start, end)]
+        touched = set(zip(climate[changed], panel_type[changed]))
+        new_rows = np.arange(start, end)
+        for key in touched:
+            kept = groups.get(key, np.empty(0, dtype=np.int64))
+            added = new_rows[(climate[start:end] == key[0]) & (panel_type[start:end] == key[1])]
+            rows = _rank(np.concatenate([kept[live[kept]], added]), self._buffers["Efficiency (%)"])
+            if len(rows):
+                groups[key] = rows
+            else:
+                groups.pop(key, None)
+        return groups, len(upserts), len(deltas) - len(upserts)
+
+    def ingest(self, source, vendor=None, chunksize=50_000):
+        """Validates a vendor feed and applies it as one delta. Returns (stats, rejected rows)."""
+        return self.ingest_chunks(read_vendor_feed(source, chunksize), vendor)
+
+    def ingest_frame(self, frame, vendor=None):
+        return self.ingest_chunks([frame], vendor)
+
+    def ingest_chunks(self, chunks, vendor=None):
+        started = time.perf_counter()
+        valid, rejected, rows = [], [], 0
+        for chunk in chunks:
+            rows += len(chunk)
+            deltas, bad = validate_feed(chunk, vendor)
+            valid.append(deltas)
+            rejected.append(bad)
+        # Within one feed the last record for a panel wins
+        deltas = pd.concat(valid, ignore_index=True).drop_duplicates(KEY, keep="last") if valid else _empty_deltas()
+        rejected = pd.concat(rejected, ignore_index=True) if rejected else pd.DataFrame()
+
+        stats = {"rows": rows, "upserts": 0, "deletes": 0, "rejected": len(rejected)}
+        with self._lock:
+            if not deltas.empty:
+                os.makedirs(self.root, exist_ok=True)
+                version = self._snapshot.version + 1
+                name = f"segment_{version:06d}.parquet"
+                for column in TEXT_COLUMNS:
+                    deltas[column] = deltas[column].astype("string")
+                deltas.to_parquet(os.path.join(self.root, name + ".tmp"), index=False)
+                os.replace(os.path.join(self.root, name + ".tmp"), os.path.join(self.root, name))
+
+                checkpoint = self._checkpoint()
+                try:
+                    groups, stats["upserts"], stats["deletes"] = self._apply(deltas, dict(self._snapshot.groups))
+                    self._segments.append(name)
+                    self._write_manifest(version)
+                except BaseException:
+                    self._restore(checkpoint)
+                    os.remove(os.path.join(self.root, name))
+                    raise
+                self._snapshot = CatalogSnapshot(version, self._views(), self._live, groups)
+        stats["version"] = self._snapshot.version
+        stats["seconds"] = time.perf_counter() - started
+        return stats, rejected
+
+    def compact(self):
+        """Rewrites the live catalog as a single segment and retires the old ones.
+
+        Retired segments are deleted by the first manifest write after
+        `RETIRED_GRACE_SECONDS`, so readers that loaded the previous manifest
+        can finish replaying them.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            version = snapshot.version + 1
+            name = f"segment_{version:06d}.parquet"
+            frame = snapshot.frame.reset_index(drop=True)
+            frame.insert(1, "Deleted", False)
+            for column in TEXT_COLUMNS:
+                frame[column] = frame[column].astype("string")
+            frame.to_parquet(os.path.join(self.root, name + ".tmp"), index=False)
+            os.replace(os.path.join(self.root, name + ".tmp"), os.path.join(self.root, name))
+
+            retired_at = time.time()
+            self._retired.update({old: retired_at for old in self._segments})
+            self._segments = [name]
+            self._write_manifest(version)
+            self._snapshot = CatalogSnapshot(version, snapshot.columns, snapshot.live, snapshot.groups)
+        return version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("feeds", nargs="*", help="Vendor feeds (.csv or .jsonl)")
+    parser.add_argument("--vendor", help="Company name for rows that don't carry one")
+    parser.add_argument("--root", default=CATALOG_DIR)
+    parser.add_argument("--compact", action="store_true", help="Merge all segments into one")
+    args = parser.parse_args()
+
+    store = CatalogStore(args.root)
+    if store.snapshot().version == 0:
+        store.ingest_frame(demo_catalog())
+    for feed in args.feeds:
+        stats, rejected = store.ingest(feed, args.vendor)
+        print(f"{feed}: {stats['upserts']:,} upserts, {stats['deletes']:,} deletes, "
+              f"{stats['rejected']:,} rejected in {stats['seconds']:.2f}s → catalog v{stats['version']}")
+        for reason, count in rejected["Reason"].value_counts().items() if len(rejected) else []:
+            print(f"  {count:,} × {reason}")
+    if args.compact or len(store._segments) > COMPACT_SEGMENTS:
+        print(f"Compacted into catalog v{store.compact()}")
+    print(f"{len(store.snapshot()):,} panels live")
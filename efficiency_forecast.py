@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from efficiency_model import (
+    OPTIMAL_EFFICIENCY_RANGE,
+    build_features,
+    predict_efficiency,
+    seasonal_humidity,
+    seasonal_temperature,
+)
+
+
+def forecast_efficiency(model, feature_columns, sites, horizon=30, start_date=None,
+                        cleaning_interval=None, daily_output_kwh=1.0, surrogate=None):
+    """Projects daily efficiency for every site over the next `horizon` days.
+
+    `sites` holds one row per site with `Dust_Level`, `Days_Since_Cleaning` and
+    `Panel_Age (years)` columns. Temperature and humidity follow the seasonal
+    model the training data was generated from, days since cleaning grow by one
+    per day and panels age continuously. With a `cleaning_interval`, cleanings
+    are scheduled every that many days starting that many days from today, so
+    every site keeps its current dirt level until its first scheduled clean and
+    day 0 always matches the unscheduled forecast. The whole sites x days
+    trajectory is scored in one predict, by the closed-form `surrogate` instead
+    of the model when one is given.
+
+    Returns `(efficiency, energy_loss)`: a sites x dates DataFrame of predicted
+    efficiency and a Series of kWh lost per site against the top of the optimal
+    range, given each site's rated `daily_output_kwh`.
+    """
+    if start_date is None:
+        start_date = pd.Timestamp.today().normalize()
+    dates = pd.date_range(start_date, periods=horizon)
+    steps = np.arange(horizon)[None, :]
+
+    temp = seasonal_temperature(dates.dayofyear.to_numpy())[None, :]
+    humidity = seasonal_humidity(dates.dayofyear.to_numpy())[None, :]
+    days_clean = sites["Days_Since_Cleaning"].to_numpy()[:, None] + steps
+    if cleaning_interval:
+        first_clean = cleaning_interval
+        days_clean = np.where(steps < first_clean, days_clean, (steps - first_clean) % cleaning_interval)
+    panel_age = sites["Panel_Age (years)"].to_numpy()[:, None] + steps / 365
+    dust = sites["Dust_Level"].to_numpy()[:, None]
+
+    if surrogate is not None:
+        predicted = surrogate.predict(temp, humidity, dust, days_clean, panel_age).reshape(len(sites), horizon)
+    else:
+        X = build_features(temp, humidity, dust, days_clean, panel_age, feature_columns)
+        predicted = predict_efficiency(model, feature_columns, X).reshape(len(sites), horizon)
+    efficiency = pd.DataFrame(predicted, index=sites.index, columns=dates)
+
+    daily_output = np.asarray(daily_output_kwh, dtype=float).reshape(-1, 1)
+    shortfall = np.clip(OPTIMAL_EFFICIENCY_RANGE[1] - predicted, 0, None) / 100
+    energy_loss = pd.Series((shortfall * daily_output).sum(axis=1), index=sites.index,
+                            name="Energy Loss (kWh)")
+
+    return efficiency, energy_loss
@@ -0,0 +1,263 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+MODEL_PATH = "pages/solar_model.pkl"
+QUANTILES = (0.1, 0.5, 0.9)  # P10 / P50 / P90
+
+
+def quantile_model_path(model_path):
+    """Where the quantile model trained alongside the point model at `model_path` is kept."""
+    return os.path.splitext(model_path)[0] + "_quantile.pkl"
+
+
+QUANTILE_MODEL_PATH = quantile_model_path(MODEL_PATH)  # Quantile model of the bundled model
+
+# XGBoost hyperparameters used for training and incremental updates
+MODEL_PARAMS = {
+    "n_estimators": 500,
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.7,
+    "random_state": 42,
+}
+
+# Advisory thresholds shared by the predictor pages
+CRITICAL_DUST_DAYS = 10  # You can adjust this threshold as needed
+OPTIMAL_EFFICIENCY_RANGE = (85, 95)  # Example efficiency range in percent
+CRITICAL_EFFICIENCY = 75
+WARNING_EFFICIENCY = 85
+ALERT_PROBABILITY = 0.2  # Alert when at least this likely to be below a threshold
+
+# Raw reading columns every uploaded table needs (training column names)
+READING_COLUMNS = [
+    "Temperature (°C)",
+    "Humidity (%)",
+    "Dust_Level",
+    "Days_Since_Cleaning",
+    "Panel_Age (years)",
+]
+
+
+# Attribution drivers shown to users, keyed by model feature
+FEATURE_DRIVERS = {
+    "Temperature (°C)": "Heat",
+    "Temp_Humidity": "Heat",
+    "Humidity (%)": "Humidity",
+    "Dust_Level_Low": "Dust",
+    "Dust_Level_Medium": "Dust",
+    "Dust_Level_High": "Dust",
+    "Days_Since_Cleaning": "Dust",
+    "Panel_Age (years)": "Age",
+}
+
+
+# Seasonal weather model (day of year -> typical conditions)
+def seasonal_temperature(dayofyear):
+    return 25 + 10 * np.sin(2 * np.pi * (np.asarray(dayofyear) - 105) / 365)
+
+
+def seasonal_humidity(dayofyear):
+    return 60 + 20 * np.cos(2 * np.pi * (np.asarray(dayofyear) - 200) / 365)
+
+
+def generate_efficiency_data(rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+    dates = pd.date_range("2023-01-01", periods=20000)
+    temp = seasonal_temperature(dates.dayofyear)
+    humidity = seasonal_humidity(dates.dayofyear)
+
+    data = {
+        "Temperature (°C)": np.clip(temp + rng.normal(0, 3, len(dates)), 15, 45),
+        "Humidity (%)": np.clip(humidity + rng.normal(0, 10, len(dates)), 20, 95),
+        "Dust_Level": rng.choice(["Low", "Medium", "High"], len(dates), p=[0.6, 0.3, 0.1]),
+        "Days_Since_Cleaning": rng.integers(1, 31, len(dates)),
+        "Panel_Age (years)": rng.integers(0, 11, len(dates)),
+    }
+
+    df = pd.DataFrame(data, index=dates)
+
+    df["Efficiency (%)"] = (
+        92 - 0.5 * df["Panel_Age (years)"]
+        - 0.15 * df["Days_Since_Cleaning"]
+        - 3 * (df["Dust_Level"] == "Medium")
+        - 7 * (df["Dust_Level"] == "High")
+        - 0.2 * (df["Temperature (°C)"] - 25) ** 2
+        + 0.1 * df["Humidity (%)"]
+        + rng.normal(0, 1.5, len(dates))
+    )
+
+    return df
+
+
+def training_features(df):
+    """Feature matrix and target for a generated training set."""
+    X = pd.get_dummies(df.drop("Efficiency (%)", axis=1))
+    X["Temp_Humidity"] = X["Temperature (°C)"] * X["Humidity (%)"] / 100
+    return X, df["Efficiency (%)"]
+
+
+def train_quantile_model(X, y, base_model=None, n_estimators=MODEL_PARAMS["n_estimators"]):
+    """Multi-quantile model for prediction intervals (one output per entry of `QUANTILES`).
+
+    With `base_model`, the `n_estimators` new trees are appended to its booster
+    (warm start) instead of training from scratch.
+    """
+    quantile_model = xgb.XGBRegressor(
+        objective="reg:quantileerror",
+        quantile_alpha=np.array(QUANTILES),
+        **{**MODEL_PARAMS, "n_estimators": n_estimators}
+    )
+    quantile_model.fit(X, y, xgb_model=None if base_model is None else base_model.get_booster())
+    return quantile_model
+
+
+def load_model(path=MODEL_PATH):
+    with open(path, "rb") as f:
+        model, feature_columns = pickle.load(f)
+    return model, feature_columns
+
+
+def load_quantile_model(path=QUANTILE_MODEL_PATH):
+    """Loads the multi-quantile model, or returns None if it hasn't been trained."""
+    if not os.path.exists(path):
+        return None
+    return load_model(path)[0]
+
+
+def build_features(temp, humidity, dust, days_clean, panel_age, feature_columns):
+    """Encodes raw readings into the model's feature matrix.
+
+    Every argument may be a scalar or an array; they are broadcast together so
+    thousands of readings are encoded in one pass. Produces the same columns as
+    `pd.get_dummies` plus `Temp_Humidity` in the training script.
+    """
+    temp, humidity, dust, days_clean, panel_age = (
+        np.ravel(a) for a in np.broadcast_arrays(temp, humidity, dust, days_clean, panel_age)
+    )
+    raw = {
+        "Temperature (°C)": temp,
+        "Humidity (%)": humidity,
+        "Days_Since_Cleaning": days_clean,
+        "Panel_Age (years)": panel_age,
+        "Temp_Humidity": temp.astype(np.float64) * humidity / 100,
+    }
+
+    X = np.zeros((len(temp), len(feature_columns)), dtype=np.float32)
+    for j, col in enumerate(feature_columns):
+        if col.startswith("Dust_Level_"):
+            X[:, j] = dust == col[len("Dust_Level_"):]
+        elif col in raw:
+            X[:, j] = raw[col]
+    return X
+
+
+def encode_readings(readings, feature_columns):
+    """Encodes a DataFrame of raw readings (training column names)."""
+    return build_features(
+        readings["Temperature (°C)"].to_numpy(),
+        readings["Humidity (%)"].to_numpy(),
+        readings["Dust_Level"].to_numpy(),
+        readings["Days_Since_Cleaning"].to_numpy(),
+        readings["Panel_Age (years)"].to_numpy(),
+        feature_columns,
+    )
+
+
+def predict_efficiency(model, feature_columns, X):
+    """Scores an encoded feature matrix in a single booster call."""
+    dmatrix = xgb.DMatrix(X, feature_names=list(feature_columns))
+    return model.get_booster().predict(dmatrix)
+
+
+def score_batch(model, feature_columns, X, quantile_model=None, contributions=False):
+    """Scores one encoded batch, sharing a single DMatrix across every output.
+
+    Returns a dict with `efficiency`, plus `quantiles` (one column per entry of
+    `QUANTILES`, sorted so intervals never cross) when a quantile model is given
+    and per-feature `contributions` (TreeSHAP, bias in `bias`) when requested.
+    With contributions the prediction is their sum, so no extra pass is needed.
+    """
+    dmatrix = xgb.DMatrix(X, feature_names=list(feature_columns))
+    booster = model.get_booster()
+    result = {}
+    if contributions:
+        contribs = booster.predict(dmatrix, pred_contribs=True)
+        result["efficiency"] = contribs.sum(axis=1)
+        result["contributions"] = contribs[:, :-1]
+        result["bias"] = contribs[:, -1]
+    else:
+        result["efficiency"] = booster.predict(dmatrix)
+    if quantile_model is not None:
+        quantiles = quantile_model.get_booster().predict(dmatrix).reshape(len(X), -1)
+        result["quantiles"] = np.sort(quantiles, axis=1)
+    return result
+
+
+def predict_with_quantiles(model, quantile_model, feature_columns, X):
+    """Scores the point and quantile models over one shared DMatrix."""
+    result = score_batch(model, feature_columns, X, quantile_model)
+    return result["efficiency"], result["quantiles"]
+
+
+def group_contributions(contributions, feature_columns):
+    """Sums per-feature contributions into the user-facing drivers."""
+    frame = pd.DataFrame(contributions, columns=list(feature_columns))
+    return frame.T.groupby(lambda feature: FEATURE_DRIVERS.get(feature, feature)).sum().T
+
+
+def explain_readings(model, feature_columns, readings):
+    """Predicted efficiency plus per-feature contributions for every reading.
+
+    Raises ValueError naming the `READING_COLUMNS` the readings are missing.
+    """
+    missing = [column for column in READING_COLUMNS if column not in readings.columns]
+    if missing:
+        raise ValueError(f"Readings are missing required columns: {', '.join(missing)}")
+    result = score_batch(model, feature_columns, encode_readings(readings, feature_columns), contributions=True)
+    drivers = group_contributions(result["contributions"], feature_columns)
+
+    explained = readings.copy()
+    explained["Predicted Efficiency (%)"] = result["efficiency"]
+    explained["Baseline (%)"] = result["bias"]
+    for j, feature in enumerate(feature_columns):
+        explained[f"Contribution: {feature}"] = result["contributions"][:, j]
+    explained["Main Driver"] = drivers.idxmin(axis=1).to_numpy()
+    return explained
+
+
+def probability_below(quantiles, threshold, levels=QUANTILES):
+    """Probability that efficiency falls below `threshold`, per row.
+
+    The predictive CDF is interpolated linearly between the quantiles and the
+    outer segments are extended to cover the tails.
+    """
+    quantiles = np.atleast_2d(quantiles)
+    levels = np.asarray(levels)
+    rows = np.arange(len(quantiles))
+    threshold = np.broadcast_to(threshold, rows.shape)
+
+    segment = np.clip((quantiles < threshold[:, None]).sum(axis=1) - 1, 0, len(levels) - 2)
+    lower = quantiles[rows, segment]
+    upper = quantiles[rows, segment + 1]
+    width = np.maximum(upper - lower, 1e-6)
+    probability = levels[segment] + (threshold - lower) / width * (levels[segment + 1] - levels[segment])
+    return np.clip(probability, 0, 1)
+
+
+if __name__ == "__main__":
+    # Trains only the bundled quantile model; the served point model is left untouched
+    parser = argparse.ArgumentParser(description="Train the P10/P50/P90 model used for prediction intervals")
+    parser.add_argument("--out", default=QUANTILE_MODEL_PATH)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the generated training data")
+    args = parser.parse_args()
+
+    X, y = training_features(generate_efficiency_data(np.random.default_rng(args.seed)))
+    with open(args.out, "wb") as f:
+        pickle.dump((train_quantile_model(X, y), X.columns), f)
+    print(f"✅ Quantile model trained and saved as '{args.out}'")
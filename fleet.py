@@ -0,0 +1,166 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from efficiency_model import (
+    CRITICAL_DUST_DAYS,
+    CRITICAL_EFFICIENCY,
+    OPTIMAL_EFFICIENCY_RANGE,
+    WARNING_EFFICIENCY,
+    encode_readings,
+    predict_efficiency,
+)
+from savings import calculate_savings
+
+REGIONS = ["North", "South", "East", "West", "Central"]
+ADVISORY_LEVELS = ["Critical", "Warning", "Optimal"]
+DUST_WEIGHTS = {"Low": 0.0, "Medium": 1.0, "High": 2.0}
+# Columns every site table needs (Region is optional)
+FLEET_COLUMNS = [
+    "Site_ID",
+    "Temperature (°C)",
+    "Humidity (%)",
+    "Dust_Level",
+    "Days_Since_Cleaning",
+    "Panel_Age (years)",
+    "Capacity (kW)",
+    "Sunlight_Hours",
+    "Electricity_Rate (₹/kWh)",
+    "Daily_Consumption (kWh)",
+]
+
+
+def generate_fleet_data(n_sites=100_000, seed=42):
+    """Synthetic fleet with the same input distributions as the training data."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Site_ID": np.char.add("SITE-", np.arange(n_sites).astype(str)),
+        "Region": pd.Categorical(rng.choice(REGIONS, n_sites), categories=REGIONS),
+        "Temperature (°C)": np.clip(rng.normal(28, 6, n_sites), 15, 45),
+        "Humidity (%)": np.clip(rng.normal(60, 15, n_sites), 20, 95),
+        "Dust_Level": rng.choice(["Low", "Medium", "High"], n_sites, p=[0.6, 0.3, 0.1]),
+        "Days_Since_Cleaning": rng.integers(1, 31, n_sites),
+        "Panel_Age (years)": rng.integers(0, 11, n_sites),
+        "Capacity (kW)": rng.choice([1.0, 2.0, 3.0, 5.0, 10.0], n_sites, p=[0.1, 0.3, 0.3, 0.2, 0.1]),
+        "Sunlight_Hours": rng.uniform(4, 7, n_sites).round(1),
+        "Electricity_Rate (₹/kWh)": rng.uniform(5, 10, n_sites).round(1),
+        "Daily_Consumption (kWh)": rng.uniform(5, 40, n_sites).round(1),
+    })
+
+
+def load_fleet(source):
+    """Loads a site table from Parquet (memory-mapped) or CSV.
+
+    Raises ValueError naming the `FLEET_COLUMNS` the table is missing.
+    """
+    name = getattr(source, "name", source)
+    if os.path.splitext(name)[1].lower() == ".parquet":
+        fleet = pd.read_parquet(source, memory_map=isinstance(source, str))
+    else:
+        fleet = pd.read_csv(source)
+    missing = [column for column in FLEET_COLUMNS if column not in fleet.columns]
+    if missing:
+        raise ValueError(f"Site table is missing required columns: {', '.join(missing)}")
+    return fleet
+
+
+def score_fleet(fleet, model, feature_columns, batch_size=50_000):
+    """Adds predicted efficiency, cleaning urgency and projected savings per site.
+
+    Sites are scored in batches of `batch_size` rows; everything else is
+    column-wise numpy over the whole fleet.
+    """
+    efficiency = np.concatenate([
+        predict_efficiency(model, feature_columns, encode_readings(fleet.iloc[start:start + batch_size], feature_columns))
+        for start in range(0, len(fleet), batch_size)
+    ])
+
+    scored = fleet.copy()
+    scored["Predicted Efficiency (%)"] = efficiency
+
+    # Same thresholds as the predictor page's maintenance advisory
+    days_clean = scored["Days_Since_Cleaning"].to_numpy()
+    dust_weight = scored["Dust_Level"].map(DUST_WEIGHTS).fillna(0).to_numpy()
+    critical = (efficiency < CRITICAL_EFFICIENCY) | ((dust_weight == 2) & (days_clean > CRITICAL_DUST_DAYS))
+    warning = (efficiency < WARNING_EFFICIENCY) | (dust_weight == 2)
+    scored["Advisory"] = pd.Categorical.from_codes(
+        np.where(critical, 0, np.where(warning, 1, 2)), categories=ADVISORY_LEVELS
+    )
+    scored["Cleaning Urgency"] = (
+        np.clip(WARNING_EFFICIENCY - efficiency, 0, None) / 10
+        + dust_weight * days_clean / CRITICAL_DUST_DAYS
+    )
+
+    rate = scored["Electricity_Rate (₹/kWh)"].to_numpy()
+    consumption = scored["Daily_Consumption (kWh)"].to_numpy()
+    sun = scored["Sunlight_Hours"].to_numpy()
+    capacity = scored["Capacity (kW)"].to_numpy()
+    *_, yearly = calculate_savings(rate, consumption, sun * np.clip(efficiency, 0, 100) / 100, capacity)
+    *_, yearly_optimal = calculate_savings(rate, consumption, sun * OPTIMAL_EFFICIENCY_RANGE[1] / 100, capacity)
+    scored["Projected Yearly Savings (₹)"] = yearly
+    scored["Savings at Risk (₹)"] = np.clip(yearly_optimal - yearly, 0, None)
+    return scored
+
+
+class FleetIndex:
+    """Precomputed sort orders and category codes for fast table queries."""
+
+    SORT_COLUMNS = [
+        "Cleaning Urgency",
+        "Predicted Efficiency (%)",
+        "Savings at Risk (₹)",
+        "Projected Yearly Savings (₹)",
+        "Days_Since_Cleaning",
+        "Panel_Age (years)",
+    ]
+    FILTER_COLUMNS = ["Advisory", "Region", "Dust_Level"]
+
+    def __init__(self, scored):
+        self.scored = scored
+        self.orders = {
+            column: np.argsort(scored[column].to_numpy(), kind="stable")
+            for column in self.SORT_COLUMNS if column in scored.columns
+        }
+        self.codes = {}
+        for column in self.FILTER_COLUMNS:
+            if column in scored.columns:
+                codes, uniques = pd.factorize(scored[column], sort=True)
+                self.codes[column] = (codes, list(uniques))
+
+    def options(self, column):
+        return self.codes[column][1]
+
+    def query(self, filters=None, sort_by="Cleaning Urgency", descending=True, limit=500):
+        """Rows matching every `{column: [values]}` filter, in sorted order."""
+        mask = np.ones(len(self.scored), dtype=bool)
+        for column, values in (filters or {}).items():
+            if not values:
+                continue
+            codes, uniques = self.codes[column]
+            wanted = [uniques.index(value) for value in values if value in uniques]
+            mask &= np.isin(codes, wanted)
+
+        order = self.orders[sort_by]
+        if descending:
+            order = order[::-1]
+        rows = order[mask[order]]
+        return self.scored.iloc[rows[:limit]], int(mask.sum())
+
+
+def binned_counts(values, bins=40, value_range=None):
+    """Histogram as a small DataFrame, so charts never ship per-site points."""
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    centers = np.round((edges[:-1] + edges[1:]) / 2, 1)
+    return pd.DataFrame({"Sites": counts}, index=pd.Index(centers, name="bin"))
+
+
+def binned_mean(x, y, bins=30):
+    """Mean of `y` per equal-width bin of `x` (empty bins dropped)."""
+    edges = np.linspace(np.min(x), np.max(x), bins + 1)
+    index = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, bins - 1)
+    totals = np.bincount(index, weights=y, minlength=bins)
+    counts = np.bincount(index, minlength=bins)
+    centers = np.round((edges[:-1] + edges[1:]) / 2, 1)
+    keep = counts > 0
+    return pd.Series(totals[keep] / counts[keep], index=centers[keep])
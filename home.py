@@ -2,6 +2,11 @@ import streamlit as st
 from streamlit_lottie import st_lottie
 import requests
 
+import pandas as pd
+
+from irradiance import daily_sun_hours
+from savings import calculate_savings
+
 # -----------------------------
 # UTILITY FUNCTIONS
 # -----------------------------
@@ -33,14 +38,6 @@ def load_lottie_url(url):
     return r.json()
 
 
-
-def calculate_savings(electricity_rate, daily_consumption, sunlight_hours, panel_capacity):
-    output_per_day = panel_capacity * sunlight_hours  # kWh/day
-    daily_savings = min(daily_consumption, output_per_day) * electricity_rate
-    monthly_savings = daily_savings * 30
-    yearly_savings = monthly_savings * 12
-    return output_per_day, daily_savings, monthly_savings, yearly_savings
-
 # -----------------------------
 # PAGE CONFIG & STYLING
 # -----------------------------
@@ -108,20 +105,36 @@ with st.container():
     with c1:
         electricity_rate = st.number_input("Electricity Rate (₹/kWh)", min_value=1.0, max_value=20.0, value=8.0, step=0.5)
         daily_consumption = st.number_input("Daily Electricity Consumption (kWh)", min_value=1.0, max_value=100.0, value=10.0, step=1.0)
+        panel_capacity = st.number_input("Solar Panel Capacity (kW)", min_value=0.5, max_value=20.0, value=3.0, step=0.5)
+        system_cost = st.number_input("Installation Cost (₹)", min_value=0.0, max_value=5000000.0, value=180000.0, step=5000.0)
 
     with c2:
-        sunlight_hours = st.number_input("Avg Sunlight Hours/Day", min_value=1.0, max_value=12.0, value=5.0, step=0.5)
-        panel_capacity = st.number_input("Solar Panel Capacity (kW)", min_value=0.5, max_value=20.0, value=3.0, step=0.5)
+        latitude = st.number_input("Latitude (°)", min_value=-60.0, max_value=60.0, value=28.61, step=0.25)
+        longitude = st.number_input("Longitude (°)", min_value=-180.0, max_value=180.0, value=77.21, step=0.25)
+        tilt = st.slider("Panel Tilt (°)", 0, 90, 25)
+        azimuth = st.slider("Panel Azimuth (° from North, 180 = South)", 0, 359, 180)
 
     if st.button("⚡ Estimate Savings", use_container_width=True):
-        output, daily, monthly, yearly = calculate_savings(
-            electricity_rate, daily_consumption, sunlight_hours, panel_capacity
+        # Daily peak sun hours for the site from the clear-sky irradiance model
+        sun_hours = daily_sun_hours(latitude, longitude, tilt, azimuth)
+        output, daily, monthly, yearly = (
+            value.mean() for value in calculate_savings(electricity_rate, daily_consumption, sun_hours, panel_capacity)
         )
         st.success(f"🌞 Monthly Savings: ₹{monthly:,.2f}")
         st.info(f"📅 Yearly Savings: ₹{yearly:,.2f}")
+        if system_cost > 0 and yearly > 0:
+            st.info(f"⏳ Payback Period: {system_cost / yearly:.1f} years")
+        st.write(f"☀️ Avg Sunlight Hours/Day: {sun_hours.mean():.2f} (peak sun hours on the panel)")
         st.write(f"🔋 Daily Solar Output: {output:.2f} kWh")
         st.write(f"💸 Daily Savings: ₹{daily:.2f}")
 
+        monthly_output = pd.Series(
+            panel_capacity * sun_hours,
+            index=pd.date_range("2023-01-01", periods=365)
+        ).resample("MS").sum()
+        st.markdown("**🔆 Estimated Monthly Solar Output (kWh)**")
+        st.bar_chart(monthly_output)
+
 # -----------------------------
 # FOOTER
 # -----------------------------
@@ -0,0 +1,128 @@
+"""Offline clear-sky irradiance and sun-position engine.
+
+Computes hourly plane-of-array irradiance for a full year from latitude,
+longitude, tilt and azimuth using closed-form models (Spencer sun position,
+Kasten-Young air mass, Meinel clear-sky beam), vectorized over all 8760 hours.
+Results are cached per quantized grid cell as compact uint16 arrays on disk.
+"""
+import functools
+import os
+import tempfile
+
+import numpy as np
+
+SOLAR_CONSTANT = 1361.0  # W/m²
+GRID_STEP = 0.25  # degrees of latitude/longitude per cache cell
+CACHE_DIR = ".irradiance_cache"
+DIFFUSE_FRACTION = 0.1  # Diffuse share of clear-sky beam irradiance
+ALBEDO = 0.2
+SKY_CLEARNESS = 0.75  # Average fraction of clear-sky energy left after clouds and haze
+
+DAY_OF_YEAR = np.repeat(np.arange(1, 366), 24)
+HOUR_OF_DAY = np.tile(np.arange(24) + 0.5, 365)  # Mid-point of each hour
+
+
+def solar_position(latitude, longitude, day_of_year=DAY_OF_YEAR, hour=HOUR_OF_DAY, utc_offset=None):
+    """Returns (cos_zenith, sun_azimuth) with azimuth in radians clockwise from north.
+
+    `hour` is local clock time at `utc_offset` hours from UTC (defaults to the
+    longitude's mean solar time).
+    """
+    if utc_offset is None:
+        utc_offset = longitude / 15
+    day_angle = 2 * np.pi * (day_of_year - 1) / 365
+
+    declination = (
+        0.006918 - 0.399912 * np.cos(day_angle) + 0.070257 * np.sin(day_angle)
+        - 0.006758 * np.cos(2 * day_angle) + 0.000907 * np.sin(2 * day_angle)
+        - 0.002697 * np.cos(3 * day_angle) + 0.00148 * np.sin(3 * day_angle)
+    )
+    equation_of_time = 229.18 * (
+        0.000075 + 0.001868 * np.cos(day_angle) - 0.032077 * np.sin(day_angle)
+        - 0.014615 * np.cos(2 * day_angle) - 0.040849 * np.sin(2 * day_angle)
+    )  # minutes
+
+    solar_time = hour + (4 * (longitude - 15 * utc_offset) + equation_of_time) / 60
+    hour_angle = np.radians(15 * (solar_time - 12))
+    lat = np.radians(latitude)
+
+    cos_zenith = np.sin(lat) * np.sin(declination) + np.cos(lat) * np.cos(declination) * np.cos(hour_angle)
+    azimuth = np.pi + np.arctan2(
+        np.sin(hour_angle),
+        np.cos(hour_angle) * np.sin(lat) - np.tan(declination) * np.cos(lat),
+    )
+    return np.clip(cos_zenith, -1, 1), azimuth
+
+
+def clear_sky(cos_zenith, day_of_year=DAY_OF_YEAR):
+    """Clear-sky (DNI, DHI, GHI) in W/m², zero while the sun is down."""
+    extraterrestrial = SOLAR_CONSTANT * (1 + 0.033 * np.cos(2 * np.pi * day_of_year / 365))
+    zenith_deg = np.degrees(np.arccos(cos_zenith))
+    up = cos_zenith > 0
+
+    air_mass = np.full_like(cos_zenith, np.inf)
+    air_mass[up] = 1 / (cos_zenith[up] + 0.50572 * (96.07995 - zenith_deg[up]) ** -1.6364)
+    dni = np.where(up, extraterrestrial * 0.7 ** (air_mass ** 0.678), 0.0)
+    dhi = DIFFUSE_FRACTION * dni
+    ghi = dni * np.clip(cos_zenith, 0, None) + dhi
+    return dni, dhi, ghi
+
+
+def plane_of_array(latitude, longitude, tilt, azimuth=180.0, albedo=ALBEDO):
+    """Hourly clear-sky irradiance (W/m²) on a tilted panel for a full year.
+
+    `tilt` is degrees from horizontal, `azimuth` degrees clockwise from north
+    (180 = facing south). Sky diffuse and ground reflection use the isotropic
+    model.
+    """
+    cos_zenith, sun_azimuth = solar_position(latitude, longitude)
+    dni, dhi, ghi = clear_sky(cos_zenith)
+
+    beta = np.radians(tilt)
+    sin_zenith = np.sqrt(1 - cos_zenith ** 2)
+    cos_incidence = cos_zenith * np.cos(beta) + sin_zenith * np.sin(beta) * np.cos(sun_azimuth - np.radians(azimuth))
+
+    return (
+        dni * np.clip(cos_incidence, 0, None)
+        + dhi * (1 + np.cos(beta)) / 2
+        + ghi * albedo * (1 - np.cos(beta)) / 2
+    )
+
+
+def _grid_key(latitude, longitude, tilt, azimuth):
+    lat = round(latitude / GRID_STEP) * GRID_STEP
+    lon = round(longitude / GRID_STEP) * GRID_STEP
+    return lat, lon, int(round(tilt)), int(round(azimuth)) % 360
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_plane_of_array(lat, lon, tilt, azimuth, cache_dir):
+    path = os.path.join(cache_dir, f"{lat:+07.2f}_{lon:+08.2f}_{tilt:02d}_{azimuth:03d}.npy")
+    if os.path.exists(path):
+        poa = np.load(path)
+    else:
+        poa = np.clip(np.round(plane_of_array(lat, lon, tilt, azimuth)), 0, np.iinfo(np.uint16).max).astype(np.uint16)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, poa)
+        os.replace(tmp_path, path)
+
+    poa = poa.astype(np.float32)
+    poa.flags.writeable = False  # Shared between callers
+    return poa
+
+
+def annual_irradiance(latitude, longitude, tilt, azimuth=180.0, cache_dir=CACHE_DIR):
+    """Hourly plane-of-array irradiance for the grid cell containing the site.
+
+    Served from memory or the on-disk cache when available (about 17 KB per
+    cell), otherwise computed and stored.
+    """
+    return _cached_plane_of_array(*_grid_key(latitude, longitude, tilt, azimuth), cache_dir)
+
+
+def daily_sun_hours(latitude, longitude, tilt, azimuth=180.0, clearness=SKY_CLEARNESS):
+    """Peak sun hours (kWh/m²/day on the panel) for each day of the year."""
+    poa = annual_irradiance(latitude, longitude, tilt, azimuth)
+    return poa.reshape(365, 24).sum(axis=1) / 1000 * clearness
@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import pickle
+import random
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from efficiency_model import MODEL_PATH, load_model, load_quantile_model, predict_efficiency, quantile_model_path
+from surrogate import distill, surrogate_path
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = "models"
+LATEST_FILE = "LATEST"
+CANDIDATE_FILE = "CANDIDATE"
+POLL_SECONDS = float(os.environ.get("MODEL_POLL_SECONDS", 5))
+SHADOW_SAMPLE_RATE = float(os.environ.get("MODEL_SHADOW_SAMPLE_RATE", 0.1))
+MAX_PENDING_SHADOW = 4  # Samples beyond this are dropped rather than queued
+
+
+def model_path(version, root=REGISTRY_DIR):
+    return os.path.join(root, f"solar_model_v{version:04d}.pkl")
+
+
+def _atomic_write(path, data):
+    # Write next to the target and rename so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _read_pointer(root, name):
+    try:
+        with open(os.path.join(root, name)) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def latest_version(root=REGISTRY_DIR):
+    """Version number of the published model, or None if nothing is published."""
+    return _read_pointer(root, LATEST_FILE)
+
+
+def candidate_version(root=REGISTRY_DIR):
+    """Version number of the model being shadow-scored, or None."""
+    return _read_pointer(root, CANDIDATE_FILE)
+
+
+def _last_version(root):
+    versions = [
+        int(name[len("solar_model_v"):-len(".pkl")])
+        for name in os.listdir(root)
+        if re.fullmatch(r"solar_model_v\d+\.pkl", name)  # Not the quantile models stored alongside
+    ]
+    return max(versions, default=0)
+
+
+def latest_model_path(root=REGISTRY_DIR, default=MODEL_PATH):
+    version = latest_version(root)
+    if version is None:
+        return default
+    return model_path(version, root)
+
+
+def publish_model(model, feature_columns, root=REGISTRY_DIR, metrics=None, candidate=False, surrogate=None,
+                  quantile_model=None):
+    """Writes a new model version and points LATEST (or CANDIDATE) at it.
+
+    The artifact, its quantile model (when given) and its closed-form
+    surrogate (distilled here unless one is given) are fully written before
+    the pointer changes, so a process reading it always finds a complete
+    model with matching intervals and surrogate. With
+    `candidate=True` the new version is only shadow-scored until
+    `promote_candidate` is called. Returns the new version number.
+    """
+    os.makedirs(root, exist_ok=True)
+    version = _last_version(root) + 1
+    path = model_path(version, root)
+
+    _atomic_write(path, pickle.dumps((model, feature_columns)))
+    if quantile_model is not None:
+        _atomic_write(quantile_model_path(path), pickle.dumps((quantile_model, feature_columns)))
+    if metrics is not None:
+        _atomic_write(path.replace(".pkl", ".json"), json.dumps(metrics, indent=2).encode())
+    surrogate = surrogate or distill(model, feature_columns)
+    surrogate.model_version = version
+    surrogate.save(surrogate_path(path))
+    _atomic_write(os.path.join(root, CANDIDATE_FILE if candidate else LATEST_FILE), str(version).encode())
+    return version
+
+
+def promote_candidate(root=REGISTRY_DIR):
+    """Makes the shadow candidate the published model. Returns its version."""
+    version = candidate_version(root)
+    if version is None:
+        raise ValueError("No candidate model to promote")
+    _atomic_write(os.path.join(root, LATEST_FILE), str(version).encode())
+    os.remove(os.path.join(root, CANDIDATE_FILE))
+    return version
+
+
+class ModelHandle:
+    """A loaded model version. Never mutated, so it can be shared across threads.
+
+    `quantile_model` is the quantile model published with this version, or
+    None if it has none.
+    """
+    __slots__ = ("version", "path", "model", "feature_columns", "quantile_model")
+
+    def __init__(self, version, path):
+        self.version = version
+        self.path = path
+        self.model, self.feature_columns = load_model(path)
+        self.quantile_model = load_quantile_model(quantile_model_path(path))
+
+    def predict(self, X):
+        return predict_efficiency(self.model, self.feature_columns, X)
+
+
+class ModelWatcher:
+    """Serves the published model and hot-swaps it when LATEST changes.
+
+    A background thread polls the registry pointers every `poll_seconds` and
+    loads new versions off the request path, then replaces the served handle
+    with a single reference assignment. Callers take the handle once per
+    request, so a swap never blocks or changes an in-flight prediction.
+
+    When a CANDIDATE is published, a `shadow_sample_rate` share of requests
+    going through `predict` / `record` is also scored by the candidate on a
+    worker thread, and the latency of both models and the prediction delta
+    are logged.
+    """
+
+    def __init__(self, root=REGISTRY_DIR, default=MODEL_PATH, poll_seconds=POLL_SECONDS,
+                 shadow_sample_rate=SHADOW_SAMPLE_RATE):
+        self.root = root
+        self.default = default
+        self.poll_seconds = poll_seconds
+        self.shadow_sample_rate = shadow_sample_rate
+        self.shadow_log = deque(maxlen=200)
+        self._current = None
+        self._candidate = None
+        self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scorer")
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refresh()
+
+    def current(self):
+        return self._current
+
+    def candidate(self):
+        return self._candidate
+
+    def refresh(self):
+        """Loads whichever pointed-to versions differ from the ones being served."""
+        version = latest_version(self.root)
+        path = self.default if version is None else model_path(version, self.root)
+        if self._current is None or self._current.path != path:
+            handle = ModelHandle(version, path)
+            self._current = handle
+            logger.info("Serving model %s", path)
+
+        version = candidate_version(self.root)
+        if version is None or version == self._current.version:
+            self._candidate = None
+        elif self._candidate is None or self._candidate.version != version:
+            self._candidate = ModelHandle(version, model_path(version, self.root))
+            logger.info("Shadow scoring candidate v%d", version)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the loaded model; a half-published version is retried next poll
+                logger.exception("Model refresh failed")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="model-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._shadow_pool.shutdown(wait=True)
+
+    def predict(self, X, handle=None):
+        """Predicted efficiency from `handle` (default: the served model), shadowed by the candidate."""
+        handle = handle or self.current()
+        start = time.perf_counter()
+        predicted = handle.predict(X)
+        self.record(handle, X, predicted, time.perf_counter() - start)
+        return predicted
+
+    def record(self, handle, X, predicted, latency):
+        """Offers a scored request (`X` encoded for `handle`) for shadow scoring."""
+        candidate = self._candidate
+        if candidate is None or candidate.version == handle.version or random.random() >= self.shadow_sample_rate:
+            return
+        with self._lock:
+            if self._pending >= MAX_PENDING_SHADOW:
+                return
+            self._pending += 1
+        self._shadow_pool.submit(self._shadow_score, handle, candidate, X, np.asarray(predicted), latency)
+
+    def _shadow_score(self, handle, candidate, X, predicted, latency):
+        try:
+            if list(candidate.feature_columns) != list(handle.feature_columns):
+                X = pd.DataFrame(X, columns=handle.feature_columns).reindex(
+                    columns=candidate.feature_columns, fill_value=0
+                ).to_numpy(dtype=np.float32)
+            start = time.perf_counter()
+            shadow = candidate.predict(X)
+            shadow_latency = time.perf_counter() - start
+            delta = shadow - predicted
+            entry = {
+                "Served Version": handle.version,
+                "Candidate Version": candidate.version,
+                "Rows": len(delta),
+                "Served Latency (ms)": latency * 1e3,
+                "Candidate Latency (ms)": shadow_latency * 1e3,
+                "Mean Delta (%)": float(delta.mean()),
+                "Max |Delta| (%)": float(np.abs(delta).max()),
+            }
+            self.shadow_log.append(entry)
+            logger.info(
+                "Shadow v%s vs v%s: %d rows, %.2f ms vs %.2f ms, mean delta %+.3f, max |delta| %.3f",
+                handle.version, candidate.version, entry["Rows"], entry["Served Latency (ms)"],
+                entry["Candidate Latency (ms)"], entry["Mean Delta (%)"], entry["Max |Delta| (%)"],
+            )
+        except Exception:
+            logger.exception("Shadow scoring failed")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def shadow_report(self):
+        return pd.DataFrame(list(self.shadow_log))
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_watcher():
+    """The process-wide ModelWatcher, started on first use and shared by every page."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ModelWatcher().start()
+        return _watcher
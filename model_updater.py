@@ -0,0 +1,151 @@
+"""Incremental model updates from field telemetry.
+
+New readings are appended to the current booster as extra trees (XGBoost
+warm start), checked on the most recent window of the batch and published to
+the model registry only if they don't make the held-out error worse. The
+version's quantile model is warm-started on the same readings and published
+with it, so intervals always come from the served model.
+
+    python model_updater.py telemetry/ --interval 300
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from efficiency_model import (
+    MODEL_PARAMS,
+    encode_readings,
+    load_model,
+    load_quantile_model,
+    predict_efficiency,
+    predict_with_quantiles,
+    quantile_model_path,
+    train_quantile_model,
+)
+from model_registry import REGISTRY_DIR, latest_model_path, latest_version, publish_model
+
+TELEMETRY_COLUMNS = [
+    "Temperature (°C)",
+    "Humidity (%)",
+    "Dust_Level",
+    "Days_Since_Cleaning",
+    "Panel_Age (years)",
+    "Efficiency (%)",
+]
+
+
+def encode_telemetry(readings, feature_columns):
+    X = encode_readings(readings, feature_columns)
+    return pd.DataFrame(X, columns=feature_columns), readings["Efficiency (%)"].to_numpy()
+
+
+def split_holdout(readings, holdout_fraction=0.2):
+    """Holds out the most recent readings (by Timestamp when present)."""
+    if "Timestamp" in readings.columns:
+        readings = readings.sort_values("Timestamp", kind="stable")
+    cut = int(len(readings) * (1 - holdout_fraction))
+    return readings.iloc[:cut], readings.iloc[cut:]
+
+
+def update_model(model, feature_columns, batch, holdout, n_new_trees=50, quantile_model=None):
+    """Appends `n_new_trees` trees fitted on `batch` to the current booster.
+
+    Returns the candidate model, its quantile model (`quantile_model` warm-
+    started the same way, or None without one) and a dict comparing its mean
+    absolute error on `holdout` against the current model.
+    """
+    X, y = encode_telemetry(batch, feature_columns)
+    X_holdout, y_holdout = encode_telemetry(holdout, feature_columns)
+
+    candidate = xgb.XGBRegressor(**{**MODEL_PARAMS, "n_estimators": n_new_trees})
+    candidate.fit(X, y, xgb_model=model.get_booster())
+    quantile_candidate = None
+    if quantile_model is not None:
+        quantile_candidate = train_quantile_model(X, y, quantile_model, n_new_trees)
+
+    baseline_mae = np.abs(predict_efficiency(model, feature_columns, X_holdout.to_numpy()) - y_holdout).mean()
+    candidate_mae = np.abs(predict_efficiency(candidate, feature_columns, X_holdout.to_numpy()) - y_holdout).mean()
+    metrics = {
+        "training_rows": len(batch),
+        "holdout_rows": len(holdout),
+        "baseline_mae": float(baseline_mae),
+        "candidate_mae": float(candidate_mae),
+        "accepted": bool(candidate_mae <= baseline_mae),
+    }
+    if quantile_candidate is not None:
+        _, quantiles = predict_with_quantiles(candidate, quantile_candidate, feature_columns, X_holdout.to_numpy())
+        metrics["interval_coverage"] = float(((quantiles[:, 0] <= y_holdout) & (y_holdout <= quantiles[:, -1])).mean())
+    return candidate, quantile_candidate, metrics
+
+
+def process_telemetry_file(path, root=REGISTRY_DIR, n_new_trees=50, holdout_fraction=0.2, shadow=False):
+    readings = pd.read_csv(path)
+    missing = [column for column in TELEMETRY_COLUMNS if column not in readings.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    readings = readings.dropna(subset=TELEMETRY_COLUMNS)
+    batch, holdout = split_holdout(readings, holdout_fraction)
+    if batch.empty or holdout.empty:
+        return {"source": path, "accepted": False, "reason": "not enough readings"}
+
+    base_path = latest_model_path(root)
+    model, feature_columns = load_model(base_path)
+    candidate, quantile_candidate, metrics = update_model(
+        model, feature_columns, batch, holdout, n_new_trees, load_quantile_model(quantile_model_path(base_path))
+    )
+    metrics["source"] = path
+    metrics["base_version"] = latest_version(root)
+    if metrics["accepted"]:
+        metrics["version"] = publish_model(candidate, feature_columns, root, metrics, candidate=shadow,
+                                           quantile_model=quantile_candidate)
+    return metrics
+
+
+def run_updater(telemetry_dir, root=REGISTRY_DIR, interval=300, once=False, **kwargs):
+    """Polls `telemetry_dir` for new CSV batches and folds each into the model.
+
+    Batches that can't be read or scored are moved to `rejected/` so they
+    neither stop the updater nor get retried on every poll.
+    """
+    processed_dir = os.path.join(telemetry_dir, "processed")
+    rejected_dir = os.path.join(telemetry_dir, "rejected")
+    os.makedirs(processed_dir, exist_ok=True)
+    os.makedirs(rejected_dir, exist_ok=True)
+
+    while True:
+        for path in sorted(glob.glob(os.path.join(telemetry_dir, "*.csv"))):
+            try:
+                metrics = process_telemetry_file(path, root, **kwargs)
+            except Exception as e:
+                os.replace(path, os.path.join(rejected_dir, os.path.basename(path)))
+                print(f"❌ Moved {path} to {rejected_dir}: {e}")
+                continue
+            os.replace(path, os.path.join(processed_dir, os.path.basename(path)))
+            if metrics["accepted"]:
+                print(f"✅ Published {'candidate' if kwargs.get('shadow') else 'model'} v{metrics['version']} from {path} "
+                      f"(MAE {metrics['baseline_mae']:.2f} → {metrics['candidate_mae']:.2f})")
+            else:
+                print(f"⚠️ Rejected update from {path}: {metrics.get('reason', metrics)}")
+        if once:
+            break
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("telemetry_dir", help="Directory that receives telemetry CSV batches")
+    parser.add_argument("--registry", default=REGISTRY_DIR)
+    parser.add_argument("--interval", type=int, default=300, help="Seconds between polls")
+    parser.add_argument("--trees", type=int, default=50, help="Trees appended per update")
+    parser.add_argument("--once", action="store_true", help="Process pending batches and exit")
+    parser.add_argument("--shadow", action="store_true",
+                        help="Publish accepted updates as shadow candidates instead of serving them")
+    args = parser.parse_args()
+
+    run_updater(args.telemetry_dir, args.registry, args.interval, args.once,
+                n_new_trees=args.trees, shadow=args.shadow)
@@ -2,34 +2,90 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-import xgboost as xgb
 from sklearn.metrics import r2_score
 import os
+import time
 from PIL import Image
 from io import BytesIO
 from PIL import Image
 import base64
 
+from efficiency_model import (
+    ALERT_PROBABILITY,
+    CRITICAL_DUST_DAYS,
+    CRITICAL_EFFICIENCY,
+    OPTIMAL_EFFICIENCY_RANGE,
+    READING_COLUMNS,
+    WARNING_EFFICIENCY,
+    build_features,
+    explain_readings,
+    group_contributions,
+    probability_below,
+    score_batch,
+)
+from efficiency_forecast import forecast_efficiency
+from model_registry import get_watcher
+from surrogate import surrogate_for, surrogate_path
+from telemetry_stream import TelemetryMonitor, read_telemetry, reference_histograms
+
+
+# Surrogate of one model version; None when that version has no matching surrogate
+@st.cache_resource
+def load_surrogate(model_path, version):
+    return surrogate_for(model_path, version)
 
-# Constants
-CRITICAL_DUST_DAYS = 10  # You can adjust this threshold as needed
-OPTIMAL_EFFICIENCY_RANGE = (85, 95)  # Example efficiency range in percent
 
+@st.cache_data
+def load_reference_histograms():
+    return reference_histograms()
+
+
+# Repeated inputs reuse the cached prediction and its attributions (per model version)
+# Intervals come only from the quantile model published with that version
+@st.cache_data(max_entries=1024)
+def explain_prediction(temp, humidity, dust, days_clean, panel_age, model_path, _handle):
+    model, feature_columns = _handle.model, _handle.feature_columns
+    X = build_features(temp, humidity, dust, days_clean, panel_age, feature_columns)
+    start = time.perf_counter()
+    result = score_batch(model, feature_columns, X, _handle.quantile_model, contributions=True)
+    get_watcher().record(_handle, X, result["efficiency"], time.perf_counter() - start)
+    drivers = group_contributions(result["contributions"], feature_columns).iloc[0]
+    quantiles = result.get("quantiles")
+    return result["efficiency"][0], result["bias"][0], drivers, quantiles
+
+
+# Closed-form scoring is a few microseconds, so it skips the cache and the ensemble
+def explain_with_surrogate(surrogate, temp, humidity, dust, days_clean, panel_age):
+    efficiency, baseline, names, contributions = surrogate.explain(temp, humidity, dust, days_clean, panel_age)
+    drivers = pd.Series(contributions[0], index=names)
+    return efficiency[0], baseline, drivers, surrogate.quantiles(efficiency)
 
-@st.cache_resource
-def load_model():
-    import pickle
-    with open("pages/solar_model.pkl", "rb") as f:
-        model, feature_columns = pickle.load(f)
-    return model, feature_columns
+
+# Waterfall from the average panel to this prediction, one bar per driver
+def plot_waterfall(baseline, drivers, efficiency):
+    drivers = drivers.reindex(drivers.abs().sort_values(ascending=False).index)
+    starts = baseline + np.concatenate([[0], np.cumsum(drivers.to_numpy())[:-1]])
+    colors = ["#2e8b57" if value >= 0 else "#d9534f" for value in drivers]
+
+    fig, ax = plt.subplots(figsize=(8, 3))
+    ax.barh(drivers.index, drivers.to_numpy(), left=starts, color=colors, height=0.6)
+    ax.axvline(baseline, color="gray", linestyle="--", linewidth=1, label=f"Average panel {baseline:.1f}%")
+    ax.axvline(efficiency, color="#026773", linewidth=2, label=f"This panel {efficiency:.1f}%")
+    ax.invert_yaxis()
+    ax.set_xlabel("Efficiency (%)")
+    ax.legend(loc="lower right", fontsize=8)
+    plt.tight_layout()
+    return fig
 
 
 # App Header
 st.title("☀️ Solar Panel Efficiency Predictor Pro")
 st.caption("Professional-grade efficiency forecasting with maintenance recommendations")
 
-# Initialize model
-model, feature_columns = load_model()
+# Initialize model (this run keeps its handle even if a new version is swapped in meanwhile)
+handle = get_watcher().current()
+model, feature_columns = handle.model, handle.feature_columns
+surrogate = load_surrogate(handle.path, handle.version)
 
 # Input Form
 with st.form(key="efficiency_form"):
@@ -75,6 +131,35 @@ with st.form(key="efficiency_form"):
         help="Visual inspection of panel surface"
     )
 
+    engines = ["Full Model (XGBoost)"] + (["Surrogate (closed-form)"] if surrogate is not None else [])
+    engine = st.selectbox(
+        "Scoring Engine",
+        engines,
+        help="The surrogate is a closed-form fit to the full model: near-identical results in microseconds"
+    )
+
+    st.markdown("**Forecast Settings**")
+    fc1, fc2, fc3 = st.columns(3)
+    with fc1:
+        horizon = st.slider("Forecast Horizon (days)", 7, 365, 30)
+    with fc2:
+        cleaning_interval = st.number_input(
+            "Cleaning Interval (days)",
+            min_value=0,
+            max_value=90,
+            value=0,
+            step=1,
+            help="0 = no scheduled cleaning during the forecast"
+        )
+    with fc3:
+        daily_output = st.number_input(
+            "Rated Daily Output (kWh)",
+            min_value=0.5,
+            max_value=200.0,
+            value=12.0,
+            step=0.5
+        )
+
     submitted = st.form_submit_button(
         "Calculate Efficiency",
         use_container_width=True
@@ -82,33 +167,34 @@ with st.form(key="efficiency_form"):
 
 # Prediction and Results
 if submitted:
-    # Prepare input features
-    input_data = {
-        "Temperature (°C)": temp,
-        "Humidity (%)": humidity,
-        "Dust_Level": dust,
-        "Days_Since_Cleaning": days_clean,
-        "Panel_Age (years)": panel_age
-    }
-
-    input_df = pd.DataFrame([input_data])
-    input_df = pd.get_dummies(input_df)
-    input_df["Temp_Humidity"] = temp * humidity / 100
-
-    # Ensure feature consistency
-    for col in feature_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0
-
-    # Predict
-    efficiency = model.predict(input_df[feature_columns])[0]
+    # Predict with per-driver attributions
+    use_surrogate = engine.startswith("Surrogate")
+    start = time.perf_counter()
+    if use_surrogate:
+        efficiency, baseline, drivers, quantiles = explain_with_surrogate(
+            surrogate, temp, humidity, dust, days_clean, panel_age
+        )
+    else:
+        efficiency, baseline, drivers, quantiles = explain_prediction(
+            temp, humidity, dust, days_clean, panel_age, handle.path, handle
+        )
+    latency_us = (time.perf_counter() - start) * 1e6
+    main_driver = drivers.idxmin()
+    if quantiles is not None:
+        p10, p50, p90 = quantiles[0]
+        p_critical = probability_below(quantiles, CRITICAL_EFFICIENCY)[0]
+        p_warning = probability_below(quantiles, WARNING_EFFICIENCY)[0]
+    else:
+        p_critical = float(efficiency < CRITICAL_EFFICIENCY)
+        p_warning = float(efficiency < WARNING_EFFICIENCY)
 
     # Display Results
     st.divider()
     st.subheader("Analysis Report")
+    st.caption(f"Scored by {engine} in {latency_us:,.0f} µs")
 
     # Efficiency Metrics
-    eff_col, range_col = st.columns(2)
+    eff_col, interval_col, range_col = st.columns(3)
     with eff_col:
         delta = efficiency - np.mean(OPTIMAL_EFFICIENCY_RANGE)
         st.metric(
@@ -118,12 +204,62 @@ if submitted:
             delta_color="inverse"
         )
 
+    with interval_col:
+        if quantiles is not None:
+            st.metric(
+                "Likely Range (P10–P90)",
+                f"{p10:.1f}–{p90:.1f}%",
+                help=f"Median estimate: {p50:.1f}%"
+            )
+        else:
+            st.metric(
+                "Likely Range (P10–P90)",
+                "n/a",
+                help="No quantile model was published with the served model; alerts use the point estimate"
+            )
+
     with range_col:
         st.metric(
             "Optimal Range", 
             f"{OPTIMAL_EFFICIENCY_RANGE[0]}–{OPTIMAL_EFFICIENCY_RANGE[1]}%"
         )
 
+    # Efficiency Drivers
+    st.subheader("Efficiency Drivers")
+    fig = plot_waterfall(baseline, drivers, efficiency)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    # Efficiency Forecast
+    st.subheader("Efficiency Forecast")
+    site = pd.DataFrame([{
+        "Dust_Level": dust,
+        "Days_Since_Cleaning": days_clean,
+        "Panel_Age (years)": panel_age
+    }])
+    forecast, energy_loss = forecast_efficiency(
+        model, feature_columns, site,
+        horizon=horizon,
+        cleaning_interval=cleaning_interval or None,
+        daily_output_kwh=daily_output,
+        surrogate=surrogate if use_surrogate else None
+    )
+    trajectory = forecast.iloc[0].rename("Efficiency (%)")
+    st.line_chart(trajectory)
+    fc_min, fc_loss = st.columns(2)
+    with fc_min:
+        st.metric(
+            "Lowest Forecast Efficiency",
+            f"{trajectory.min():.1f}%",
+            help=f"Expected on {trajectory.idxmin():%B %d, %Y}"
+        )
+    with fc_loss:
+        st.metric(
+            f"Expected Energy Loss ({horizon} days)",
+            f"{energy_loss.iloc[0]:.1f} kWh",
+            help=f"Shortfall against {OPTIMAL_EFFICIENCY_RANGE[1]}% efficiency"
+        )
+
     # Maintenance Recommendations
     st.subheader("Maintenance Advisory")
     alert = st.container()
@@ -147,16 +283,20 @@ if submitted:
         alert.write("---")
 
     # Priority 2: Efficiency Alerts
-    if efficiency < 75:
+    if p_critical >= ALERT_PROBABILITY:
         alert.error(f"""
         🚨 **Critical Efficiency Alert**  
         - System underperforming by **{OPTIMAL_EFFICIENCY_RANGE[1] - efficiency:.1f}%**  
+        - **{p_critical:.0%}** chance of running below **{CRITICAL_EFFICIENCY}%**  
+        - Biggest drag: **{main_driver}** ({drivers[main_driver]:+.1f}% vs average panel)  
         - **Immediate inspection recommended**  
         """)
-    elif efficiency < 85:
+    elif p_warning >= ALERT_PROBABILITY:
         alert.warning(f"""
         ⚠️ **Efficiency Warning**  
         - Performance below optimal by **{OPTIMAL_EFFICIENCY_RANGE[1] - efficiency:.1f}%**  
+        - **{p_warning:.0%}** chance of running below **{WARNING_EFFICIENCY}%**  
+        - Biggest drag: **{main_driver}** ({drivers[main_driver]:+.1f}% vs average panel)  
         - Schedule maintenance within **3 days**  
         """)
     else:
@@ -219,9 +359,68 @@ if submitted:
         - Consider professional efficiency test  
         """)
 
+# Batch Scoring Section
+with st.expander("📄 Batch Scoring", expanded=False):
+    st.caption(
+        "Upload a CSV with " + ", ".join(READING_COLUMNS) + " columns to score every row with its efficiency drivers"
+    )
+    batch_file = st.file_uploader("Panel Readings", type="csv", key="batch_upload")
+
+    if batch_file is not None:
+        try:
+            explained = explain_readings(model, feature_columns, pd.read_csv(batch_file))
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+        else:
+            st.dataframe(explained.head(100), use_container_width=True)
+            st.download_button(
+                "⬇️ Download Predictions & Attributions",
+                explained.to_csv(index=False).encode("utf-8"),
+                file_name="efficiency_attributions.csv",
+                mime="text/csv"
+            )
+
+# Telemetry Monitoring Section
+with st.expander("📡 Telemetry Monitor", expanded=False):
+    st.caption(
+        "Upload a sensor log (CSV with Site_ID, Temperature (°C), Humidity (%), Dust_Level, "
+        "Days_Since_Cleaning, Panel_Age (years) and optionally measured Efficiency (%))"
+    )
+    telemetry_file = st.file_uploader("Sensor Log", type="csv", key="telemetry_upload")
+
+    if telemetry_file is not None:
+        try:
+            with st.spinner("Streaming readings..."):
+                monitor = TelemetryMonitor(
+                    feature_columns,
+                    lambda X: get_watcher().predict(X, handle),
+                    histograms=load_reference_histograms()
+                )
+                monitor.run(read_telemetry([telemetry_file]))
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+        else:
+            st.write(f"Processed **{monitor.readings:,}** readings from **{len(monitor.site_ids):,}** sites")
+
+            drift = monitor.drift_report()
+            drifted = drift.loc[drift["Drifted"], "Feature"].tolist()
+            if drifted:
+                st.warning(f"⚠️ **Input drift detected** in: {', '.join(drifted)} - predictions may be less reliable")
+            else:
+                st.success("✅ Inputs match the training distribution")
+            st.dataframe(drift.style.format({"PSI": "{:.3f}", "KS": "{:.3f}"}), use_container_width=True)
+
+            sites = monitor.site_report()
+            anomalies = sites[sites["Anomaly"]]
+            if not anomalies.empty:
+                st.error(f"🚨 **{len(anomalies)} site(s) underperforming** their predicted efficiency")
+                st.dataframe(anomalies, use_container_width=True)
+            else:
+                st.info("No per-site anomalies flagged")
+
 # Model Information Section
 with st.expander("Technical Documentation", expanded=False):
-    tab1, tab2 = st.tabs(["Model Specs", "Feature Importance"])
+    tab1, tab2 = st.tabs(["Model Specs", "Prediction Drivers"])
 
     with tab1:
         st.markdown(f"""
@@ -233,14 +432,32 @@ with st.expander("Technical Documentation", expanded=False):
         **Alert Thresholds**
         - High dust: Immediate cleaning
         - >{CRITICAL_DUST_DAYS} days since cleaning: Urgent action
-        - <75% efficiency: Critical alert
+        - ≥{ALERT_PROBABILITY:.0%} chance of <{CRITICAL_EFFICIENCY}% efficiency: Critical alert
+        - ≥{ALERT_PROBABILITY:.0%} chance of <{WARNING_EFFICIENCY}% efficiency: Warning
+
+        **Serving**
+        - Model: `{handle.path}`
         """)
 
+        if surrogate is not None:
+            st.markdown(f"**Surrogate** ({len(surrogate.terms)} terms, `{surrogate_path(handle.path)}`): "
+                        "held-out accuracy")
+            st.dataframe(pd.DataFrame(surrogate.metrics).T.round(3), use_container_width=True)
+
+        shadow = get_watcher().shadow_report()
+        if not shadow.empty:
+            st.markdown("**Shadow Scoring** (candidate model vs served model)")
+            st.dataframe(shadow.tail(20), use_container_width=True)
+
     with tab2:
-        fig, ax = plt.subplots(figsize=(8, 4))
-        xgb.plot_importance(model, ax=ax, height=0.8)
-        plt.tight_layout()
-        st.pyplot(fig)
+        st.markdown("""
+        **How drivers are computed**
+        - Each prediction is split into per-feature contributions (TreeSHAP) in the same booster call
+        - Contributions are measured against the average panel in the training data
+        - Features are grouped into drivers: **Dust** (dust level, days since cleaning), **Heat** (temperature, temperature × humidity), **Humidity** and **Age**
+        - Batch Scoring exports the per-feature contributions for every row
+        - The surrogate is additive, so its drivers are its own exact per-term contributions against the same average panel; they can differ from the full model's TreeSHAP breakdown
+        """)
 
 # Footer
 st.divider()
@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from efficiency_model import CRITICAL_EFFICIENCY, OPTIMAL_EFFICIENCY_RANGE, WARNING_EFFICIENCY
+from fleet import FLEET_COLUMNS, FleetIndex, binned_counts, binned_mean, generate_fleet_data, load_fleet, score_fleet
+from model_registry import get_watcher
+
+DISPLAY_ROWS = 500
+
+
+# Scored fleet and its indexes are shared by every session (keyed by source + model)
+@st.cache_resource(max_entries=4)
+def build_fleet_index(source_key, _source, model_path, _handle):
+    fleet = generate_fleet_data() if _source is None else load_fleet(_source)
+    return FleetIndex(score_fleet(fleet, _handle.model, _handle.feature_columns))
+
+
+st.title("🛰️ Fleet Overview")
+st.caption("Predicted efficiency, cleaning urgency and projected savings across every site")
+
+uploaded = st.file_uploader(
+    "Site Table (Parquet or CSV) - leave empty to explore the demo fleet",
+    type=["parquet", "csv"],
+    help="One row per site with columns: " + ", ".join(FLEET_COLUMNS) + " (Region is optional)"
+)
+source_key = "demo" if uploaded is None else uploaded.file_id
+handle = get_watcher().current()
+
+with st.spinner("Scoring fleet..."):
+    try:
+        index = build_fleet_index(source_key, uploaded, handle.path, handle)
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        st.stop()
+scored = index.scored
+
+# Fleet Summary
+m1, m2, m3, m4 = st.columns(4)
+with m1:
+    st.metric("Sites", f"{len(scored):,}")
+with m2:
+    st.metric("Mean Efficiency", f"{scored['Predicted Efficiency (%)'].mean():.1f}%")
+with m3:
+    st.metric("Critical Sites", f"{(scored['Advisory'] == 'Critical').sum():,}")
+with m4:
+    st.metric("Yearly Savings at Risk", f"₹{scored['Savings at Risk (₹)'].sum():,.0f}")
+
+# Filters
+st.subheader("Sites")
+f1, f2, f3 = st.columns(3)
+filters = {}
+with f1:
+    filters["Advisory"] = st.multiselect("Advisory", index.options("Advisory"), default=["Critical"])
+with f2:
+    if "Region" in index.codes:
+        filters["Region"] = st.multiselect("Region", index.options("Region"))
+with f3:
+    filters["Dust_Level"] = st.multiselect("Dust Level", index.options("Dust_Level"))
+
+s1, s2 = st.columns([3, 1])
+with s1:
+    sort_by = st.selectbox("Sort By", list(index.orders))
+with s2:
+    descending = st.toggle("Descending", value=True)
+
+rows, matches = index.query(filters, sort_by, descending, limit=DISPLAY_ROWS)
+st.caption(f"Showing {len(rows):,} of {matches:,} matching sites")
+st.dataframe(
+    rows.style.format({
+        "Temperature (°C)": "{:.1f}",
+        "Humidity (%)": "{:.1f}",
+        "Predicted Efficiency (%)": "{:.1f}",
+        "Cleaning Urgency": "{:.2f}",
+        "Projected Yearly Savings (₹)": "₹{:,.0f}",
+        "Savings at Risk (₹)": "₹{:,.0f}",
+    }),
+    use_container_width=True
+)
+
+# Charts are aggregated on the server so only a few dozen points are rendered
+st.subheader("Fleet Analysis")
+c1, c2 = st.columns(2)
+with c1:
+    st.markdown("**Predicted Efficiency Distribution**")
+    st.bar_chart(binned_counts(scored["Predicted Efficiency (%)"].to_numpy(), bins=40))
+    st.caption(
+        f"Critical below {CRITICAL_EFFICIENCY}% · Warning below {WARNING_EFFICIENCY}% · "
+        f"Optimal {OPTIMAL_EFFICIENCY_RANGE[0]}–{OPTIMAL_EFFICIENCY_RANGE[1]}%"
+    )
+with c2:
+    st.markdown("**Mean Efficiency by Days Since Cleaning**")
+    st.line_chart(binned_mean(
+        scored["Days_Since_Cleaning"].to_numpy(),
+        scored["Predicted Efficiency (%)"].to_numpy()
+    ))
+
+if "Region" in scored.columns:
+    st.markdown("**Regional Summary**")
+    summary = scored.groupby("Region", observed=True).agg(
+        Sites=("Site_ID", "size"),
+        Mean_Efficiency=("Predicted Efficiency (%)", "mean"),
+        Critical=("Advisory", lambda advisory: (advisory == "Critical").sum()),
+        Savings_at_Risk=("Savings at Risk (₹)", "sum"),
+    )
+    st.dataframe(summary.style.format({"Mean_Efficiency": "{:.1f}%", "Savings_at_Risk": "₹{:,.0f}"}))
+
+st.divider()
+st.caption("© 2023 Solar Analytics Pro | v1.3.0")
@@ -9,6 +9,11 @@ import smtplib
 from email.message import EmailMessage
 from twilio.rest import Client
 
+from catalog import PanelSelection
+from catalog_store import CatalogStore, demo_catalog
+from session_memory import accountant, current_session_id
+from sizing import CLIMATE_SUN_HOURS, build_catalog_index, optimize_system
+
 TWILIO_ACCOUNT_SID = st.secrets["TWILIO_ACCOUNT_SID"]
 TWILIO_AUTH_TOKEN = st.secrets["TWILIO_AUTH_TOKEN"]
 TWILIO_PHONE_NUMBER = st.secrets["TWILIO_PHONE_NUMBER"]
@@ -19,26 +24,27 @@ SENDER_EMAIL = st.secrets["SENDER_EMAIL"]
 SENDER_PASSWORD = st.secrets["SENDER_PASSWORD"]
 
 
-# Cache dataset generation to improve performance
-@st.cache_data
-def generate_solar_panel_data():
-    np.random.seed(42)
-    companies = ["Tata Power", "Luminous", "Adani Solar", "Vikram Solar", "Waaree"]
-    panel_types = ["Monocrystalline", "Polycrystalline", "Thin-film"]
-    climates = ["Hot", "Sunny", "Temperate", "Cloudy"]
-
-    data = {
-        "Company": np.random.choice(companies, 20000),
-        "Panel_Type": np.random.choice(panel_types, 20000, p=[0.4, 0.4, 0.2]),
-        "Efficiency (%)": np.random.uniform(14, 22, 20000),
-        "Power_Output (W)": np.random.randint(250, 500, 20000),
-        "Lifespan (years)": np.random.randint(20, 30, 20000),
-        "Warranty (years)": np.random.randint(10, 25, 20000),
-        "Cost (₹)": np.random.randint(10000, 50000, 20000),
-        "Best_Climate": np.random.choice(climates, 20000)
-    }
-
-    return pd.DataFrame(data)
+# Catalog store shared by every session; vendor feeds are applied to it as deltas
+@st.cache_resource
+def get_catalog_store():
+    store = CatalogStore()
+    if store.snapshot().version == 0:
+        store.ingest_frame(demo_catalog())
+    return store
+
+# Pareto fronts per climate, built once per catalog version and shared by every sizing query
+@st.cache_resource(max_entries=2)
+def load_catalog_index(version, _snapshot):
+    return build_catalog_index(_snapshot.frame)
+
+# Row IDs of this session's recommendations, recomputed when the query or catalog changes
+def session_recommendations(session_id, snapshot):
+    query = st.session_state.recommendation_query
+    cached = accountant.get(session_id, "recommendation_ids")
+    if cached is None or cached[:2] != (snapshot.version, query):
+        cached = accountant.put(session_id, "recommendation_ids",
+                                (snapshot.version, query, snapshot.recommend(*query)))
+    return cached[2]
 
 # Function to determine panel type based on budget
 def get_panel_category(budget):
@@ -51,8 +57,7 @@ def get_panel_category(budget):
 
 # Function to handle booking
 def select_panel(company, panel_type):
-    st.session_state.selected_panel = panel_type
-    st.session_state.selected_company = company
+    st.session_state.selection = PanelSelection(company, panel_type)
     st.session_state.show_payment = True
 
 # Function to send email
@@ -163,6 +168,35 @@ def show_data_analysis(df):
         fig, ax = plt.subplots()
         sns.scatterplot(data=df, x="Cost (₹)", y="Efficiency (%)", hue="Panel_Type", palette="coolwarm", ax=ax)
         st.pyplot(fig)
+
+# Function to size a complete system from a mix of catalog panels
+def show_system_sizing(snapshot, climate):
+    with st.expander("🧮 **System Sizing Optimizer**"):
+        st.markdown("Find the cheapest combination of panels that covers your daily consumption.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            daily_kwh = st.number_input("Daily Consumption (kWh)", min_value=1.0, max_value=200.0, value=10.0, step=1.0)
+        with col2:
+            system_budget = st.number_input("System Budget (₹)", min_value=10000, max_value=5000000, value=200000, step=10000)
+        with col3:
+            sun_hours = st.number_input("Peak Sun Hours/Day", min_value=1.0, max_value=10.0,
+                                        value=CLIMATE_SUN_HOURS[climate], step=0.5)
+
+        if st.button("Optimize System"):
+            results = optimize_system(snapshot.frame, load_catalog_index(snapshot.version, snapshot),
+                                      daily_kwh, system_budget, climate, sun_hours)
+            if results.empty:
+                st.warning("No panel fits within this budget.")
+            else:
+                if results["Coverage (%)"].iloc[0] < 100:
+                    st.warning("⚠️ The budget can't cover your full consumption - showing the highest-output options.")
+                st.dataframe(results.style.format({
+                    "Total Cost (₹)": "₹{:,.0f}",
+                    "Daily Output (kWh)": "{:.2f}",
+                    "Coverage (%)": "{:.0f}%",
+                    "₹ per kWh/day": "₹{:,.0f}",
+                }), use_container_width=True)
+
 # Main function
 def show_recommendation():
     st.title("🌞 Solar Panel Recommendation System")
@@ -170,7 +204,9 @@ def show_recommendation():
     if 'show_payment' not in st.session_state:
         st.session_state.show_payment = False
 
-    df = generate_solar_panel_data()
+    # One snapshot per run, so every section shows the same catalog version
+    snapshot = get_catalog_store().refresh()
+    df = snapshot.frame
 
     col1, col2 = st.columns(2)
     with col1:
@@ -180,32 +216,31 @@ def show_recommendation():
 
     preferred_type = get_panel_category(budget)  # Determine panel type based on budget
 
+    # Session state keeps only the query; the matching row IDs are derived data
+    # held by the memory accountant and recomputed if they were evicted
+    session_id = current_session_id()
     if st.button("Get Recommendations"):
-        suitable_panels = df[(df["Cost (₹)"] <= budget) & 
-                             (df["Best_Climate"] == climate) & 
-                             (df["Panel_Type"] == preferred_type)]
-
-        if suitable_panels.empty:
-            suitable_panels = df[(df["Cost (₹)"] <= budget) & (df["Panel_Type"] == preferred_type)]
-
-        if suitable_panels.empty:
-            suitable_panels = df[df["Cost (₹)"] <= budget]
-
-        st.session_state.recommendations = suitable_panels.sort_values("Efficiency (%)", ascending=False).head(3)
+        st.session_state.recommendation_query = (budget, climate, preferred_type)
         st.session_state.show_payment = False
 
+    recommendation_ids = None
+    if 'recommendation_query' in st.session_state:
+        recommendation_ids = session_recommendations(session_id, snapshot)
+    accountant.observe_state(session_id, st.session_state)
+
     if st.session_state.show_payment:
         show_payment_gateway(
-            st.session_state.selected_panel,
-            st.session_state.selected_company
+            st.session_state.selection.panel_type,
+            st.session_state.selection.company
         )
-    elif 'recommendations' in st.session_state and not st.session_state.recommendations.empty:
+    elif recommendation_ids is not None and len(recommendation_ids):
         st.markdown("### 🔥 Top Recommendations:")
+        recommendations = df.loc[recommendation_ids]
 
         # Ensure recommendations are displayed horizontally
-        cols = st.columns(len(st.session_state.recommendations))
+        cols = st.columns(len(recommendations))
 
-        for idx, (_, row) in enumerate(st.session_state.recommendations.iterrows()):
+        for idx, (_, row) in enumerate(recommendations.iterrows()):
             with cols[idx]:
                 st.markdown(f"""
                 **{row['Company']} - {row['Panel_Type']}**  
@@ -219,6 +254,9 @@ def show_recommendation():
                 if st.button(f"Book {row['Company']}", key=f"{row['Company']}_{idx}"):
                     select_panel(row['Company'], row['Panel_Type'])
 
+    # System Sizing Section
+    show_system_sizing(snapshot, climate)
+
     # Data Analysis Section inside a dropdown (expander)
     show_data_analysis(df)
 
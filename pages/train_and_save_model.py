@@ -1,47 +1,25 @@
-import pandas as pd
+import os
+import sys
 import numpy as np
+import pandas as pd
 import xgboost as xgb
 import pickle
 
-def generate_efficiency_data():
-    dates = pd.date_range("2023-01-01", periods=20000)
-    temp = 25 + 10 * np.sin(2 * np.pi * (dates.dayofyear - 105) / 365)
-    humidity = 60 + 20 * np.cos(2 * np.pi * (dates.dayofyear - 200) / 365)
-
-    data = {
-        "Temperature (°C)": np.clip(temp + np.random.normal(0, 3, len(dates)), 15, 45),
-        "Humidity (%)": np.clip(humidity + np.random.normal(0, 10, len(dates)), 20, 95),
-        "Dust_Level": np.random.choice(["Low", "Medium", "High"], len(dates), p=[0.6, 0.3, 0.1]),
-        "Days_Since_Cleaning": np.random.randint(1, 31, len(dates)),
-        "Panel_Age (years)": np.random.randint(0, 11, len(dates)),
-    }
-
-    df = pd.DataFrame(data, index=dates)
-
-    df["Efficiency (%)"] = (
-        92 - 0.5 * df["Panel_Age (years)"] 
-        - 0.15 * df["Days_Since_Cleaning"]
-        - 3 * (df["Dust_Level"] == "Medium") 
-        - 7 * (df["Dust_Level"] == "High")
-        - 0.2 * (df["Temperature (°C)"] - 25) ** 2
-        + 0.1 * df["Humidity (%)"]
-        + np.random.normal(0, 1.5, len(dates))
-    )
-
-    return df
-
-df = generate_efficiency_data()
-X = pd.get_dummies(df.drop("Efficiency (%)", axis=1))
-X["Temp_Humidity"] = X["Temperature (°C)"] * X["Humidity (%)"] / 100
-y = df["Efficiency (%)"]
-
-model = xgb.XGBRegressor(
-    n_estimators=500,
-    max_depth=6,
-    learning_rate=0.05,
-    subsample=0.7,
-    random_state=42
+# Allow running this script directly from the pages/ directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from efficiency_model import (
+    MODEL_PARAMS,
+    generate_efficiency_data,
+    quantile_model_path,
+    train_quantile_model,
+    training_features,
 )
+from model_registry import REGISTRY_DIR, publish_model
+from surrogate import distill, surrogate_path
+
+X, y = training_features(generate_efficiency_data())
+
+model = xgb.XGBRegressor(**MODEL_PARAMS)
 model.fit(X, y)
 
 # Save the model and features
@@ -49,3 +27,24 @@ with open("solar_model.pkl", "wb") as f:
     pickle.dump((model, X.columns), f)
 
 print("✅ Model trained and saved as 'solar_model.pkl'")
+
+# Closed-form surrogate distilled from the model, for low-latency scoring
+surrogate = distill(model, X.columns)
+surrogate.save(surrogate_path("solar_model.pkl"))
+
+fidelity = surrogate.metrics["surrogate_vs_ensemble"]
+print(f"✅ Surrogate distilled and saved as '{surrogate_path('solar_model.pkl')}' (MAE {fidelity['mae']:.2f}% vs model)")
+
+# Quantile model for prediction intervals (one output per quantile)
+quantile_model = train_quantile_model(X, y)
+
+with open(quantile_model_path("solar_model.pkl"), "wb") as f:
+    pickle.dump((quantile_model, X.columns), f)
+
+print(f"✅ Quantile model trained and saved as '{quantile_model_path('solar_model.pkl')}'")
+
+# Serving follows the registry once any update is published, so publish the retrain there too
+registry = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), REGISTRY_DIR)
+version = publish_model(model, X.columns, registry, {"source": "full retrain", "training_rows": len(X)},
+                        surrogate=surrogate, quantile_model=quantile_model)
+print(f"✅ Model, quantile model and surrogate published to the registry as v{version}")
@@ -0,0 +1,10 @@
+import numpy as np
+
+
+# Works on scalars or equally shaped arrays (one entry per site)
+def calculate_savings(electricity_rate, daily_consumption, sunlight_hours, panel_capacity):
+    output_per_day = panel_capacity * sunlight_hours  # kWh/day
+    daily_savings = np.minimum(daily_consumption, output_per_day) * electricity_rate
+    monthly_savings = daily_savings * 30
+    yearly_savings = monthly_savings * 12
+    return output_per_day, daily_savings, monthly_savings, yearly_savings
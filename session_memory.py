@@ -0,0 +1,181 @@
+"""Per-process accounting of the memory each Streamlit session holds.
+
+Pages keep only small inputs and row IDs in `st.session_state` and park
+anything derived from them (result sets, lookups) in the accountant, which
+forgets sessions that have gone idle and drops derived data when the process
+goes over budget. Callers recompute evicted data from the inputs on their
+next rerun.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = float(os.environ.get("SESSION_MEMORY_BUDGET_MB", 64))
+DEFAULT_IDLE_SECONDS = float(os.environ.get("SESSION_IDLE_SECONDS", 600))
+
+
+def sizeof(value):
+    """Approximate deep size in bytes of a session value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(np.empty(0))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True, index=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if hasattr(value, "__slots__"):
+        return sys.getsizeof(value) + sum(
+            sizeof(getattr(value, slot)) for slot in value.__slots__ if hasattr(value, slot)
+        )
+    return sys.getsizeof(value)
+
+
+class _SessionEntry:
+    __slots__ = ("last_seen", "state_bytes", "derived")
+
+    def __init__(self, now):
+        self.last_seen = now
+        self.state_bytes = 0
+        self.derived = {}  # key -> (value, bytes)
+
+    def derived_bytes(self):
+        return sum(size for _, size in self.derived.values())
+
+
+class SessionMemoryAccountant:
+    """Tracks bytes per session and drops what closed or idle sessions hold.
+
+    Sessions not seen for `idle_seconds` (closed or abandoned tabs) are
+    forgotten on the next write, whatever the budget. `budget_bytes` caps the
+    derived data held for all sessions together; when it's exceeded, derived
+    data is dropped from the least recently seen sessions first, and they
+    recompute it on their next rerun.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 2**20, idle_seconds=DEFAULT_IDLE_SECONDS):
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self._sessions = OrderedDict()
+        self._state_total = 0
+        self._derived_total = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expired = 0
+
+    def _entry(self, session_id):
+        now = time.monotonic()
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = _SessionEntry(now)
+        entry.last_seen = now
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def _drop(self, session_id):
+        entry = self._sessions.pop(session_id)
+        self._state_total -= entry.state_bytes
+        self._derived_total -= entry.derived_bytes()
+
+    def _expire_idle(self):
+        now = time.monotonic()
+        # OrderedDict is kept in last-seen order, so idle sessions come first
+        idle = []
+        for session_id, entry in self._sessions.items():
+            if now - entry.last_seen < self.idle_seconds:
+                break
+            idle.append(session_id)
+        for session_id in idle:
+            self._drop(session_id)
+        self.expired += len(idle)
+
+    def observe_state(self, session_id, state):
+        """Records the size of a session's own state (only dropped with the session)."""
+        size = sum(sizeof(key) + sizeof(value) for key, value in state.items())
+        with self._lock:
+            self._expire_idle()
+            entry = self._entry(session_id)
+            self._state_total += size - entry.state_bytes
+            entry.state_bytes = size
+
+    def put(self, session_id, key, value):
+        size = sizeof(value)
+        with self._lock:
+            self._expire_idle()
+            entry = self._entry(session_id)
+            self._derived_total += size - entry.derived.get(key, (None, 0))[1]
+            entry.derived[key] = (value, size)
+            self._enforce_budget()
+        return value
+
+    def get(self, session_id, key, default=None):
+        with self._lock:
+            return self._entry(session_id).derived.get(key, (default, 0))[0]
+
+    def get_or_compute(self, session_id, key, compute):
+        value = self.get(session_id, key)
+        if value is None:
+            value = self.put(session_id, key, compute())
+        return value
+
+    def forget(self, session_id):
+        with self._lock:
+            if session_id in self._sessions:
+                self._drop(session_id)
+
+    def total_derived_bytes(self):
+        return self._derived_total
+
+    def total_bytes(self):
+        """State and derived bytes held for all tracked sessions."""
+        return self._state_total + self._derived_total
+
+    def _enforce_budget(self):
+        # Least recently seen first; the session being written to comes last
+        for session_id, entry in self._sessions.items():
+            if self._derived_total <= self.budget_bytes:
+                break
+            freed = entry.derived_bytes()
+            if not freed:
+                continue
+            entry.derived.clear()
+            self._derived_total -= freed
+            self.evictions += 1
+            logger.info("Evicted %d bytes of derived data from session %s", freed, session_id)
+
+    def report(self):
+        """Bytes held per session, most recently active first."""
+        now = time.monotonic()
+        with self._lock:
+            rows = [
+                {
+                    "Session": session_id,
+                    "State Bytes": entry.state_bytes,
+                    "Derived Bytes": entry.derived_bytes(),
+                    "Derived Items": len(entry.derived),
+                    "Idle (s)": round(now - entry.last_seen, 1),
+                }
+                for session_id, entry in reversed(self._sessions.items())
+            ]
+        return pd.DataFrame(rows, columns=["Session", "State Bytes", "Derived Bytes", "Derived Items", "Idle (s)"])
+
+
+# One accountant per worker process, shared by every page
+accountant = SessionMemoryAccountant()
+
+
+def current_session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
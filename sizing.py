@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+# Typical peak sun hours per climate when no site irradiance is known
+CLIMATE_SUN_HOURS = {"Hot": 6.0, "Sunny": 5.5, "Temperate": 4.5, "Cloudy": 3.5}
+CLIMATE_MISMATCH_FACTOR = 0.9  # Output derate for panels rated for another climate
+COST_STEP = 100  # ₹ resolution of the budget dimension in the optimizer
+
+
+class CatalogFront:
+    """Pareto-optimal panels for one climate, sorted by cost.
+
+    A panel is kept only if no cheaper (or equally priced) panel delivers at
+    least as much derated power, which shrinks a 20k-row catalog to a handful
+    of candidates per climate.
+    """
+
+    def __init__(self, catalog, climate):
+        watts = catalog["Power_Output (W)"].to_numpy(dtype=float)
+        watts = np.where(catalog["Best_Climate"].to_numpy() == climate, watts, watts * CLIMATE_MISMATCH_FACTOR)
+        cost = catalog["Cost (₹)"].to_numpy(dtype=float)
+
+        order = np.lexsort((-watts, cost))
+        best_so_far = np.maximum.accumulate(watts[order])
+        keep = np.r_[True, watts[order][1:] > best_so_far[:-1]]
+
+        self.rows = catalog.index.to_numpy()[order[keep]]
+        self.cost = cost[order[keep]]
+        self.watts = watts[order[keep]]
+
+
+def build_catalog_index(catalog):
+    """Precomputes the Pareto front of every climate (reused across queries)."""
+    return {climate: CatalogFront(catalog, climate) for climate in CLIMATE_SUN_HOURS}
+
+
+def _solve(cost_units, energy, capacity):
+    # Unbounded knapsack: best[b] = most energy for at most b cost units.
+    # Each panel is added in batches of 1, 2, 4, ... copies (any count is a sum
+    # of distinct batches), so every batch is one vectorized pass over all
+    # budget levels and the loop runs items x log2(capacity) times.
+    best = np.zeros(capacity + 1)
+    batches = []
+    for item, (cost, kwh) in enumerate(zip(cost_units, energy)):
+        copies = 1
+        while copies * cost <= capacity:
+            shift = copies * cost
+            candidates = best[:-shift] + copies * kwh
+            taken = candidates > best[shift:]
+            best[shift:] = np.where(taken, candidates, best[shift:])
+            batches.append((item, copies, shift, taken))
+            copies *= 2
+    return best, batches
+
+
+def _reconstruct(batches, b):
+    counts = {}
+    for item, copies, shift, taken in reversed(batches):
+        if b >= shift and taken[b - shift]:
+            counts[item] = counts.get(item, 0) + copies
+            b -= shift
+    return counts
+
+
+def optimize_system(catalog, index, daily_kwh, budget, climate, sun_hours=None, top_k=5):
+    """Best panel combinations covering `daily_kwh` within `budget`.
+
+    Mixes any number of catalog panels (repeats allowed). Configurations that
+    cover the demand are ranked by total cost, i.e. cost per kWh of demand
+    covered; if none fits the budget, the ones producing the most energy are
+    returned instead.
+    """
+    if sun_hours is None:
+        sun_hours = CLIMATE_SUN_HOURS[climate]
+    front = index[climate]
+    cost_units = np.ceil(front.cost / COST_STEP).astype(np.int64)
+    energy = front.watts * sun_hours / 1000  # kWh/day per panel
+    # No cheapest cover costs more than the cheapest single-panel-type cover;
+    # one extra panel of headroom leaves room for the runner-up configurations
+    single_type_cover = int((np.ceil(daily_kwh / energy) * cost_units).min())
+    capacity = min(int(budget // COST_STEP), single_type_cover + int(cost_units.max()))
+
+    best, batches = _solve(cost_units, energy, capacity)
+
+    # Every budget level where a new configuration appears is a candidate
+    levels = np.flatnonzero(np.diff(best) > 0) + 1
+    if len(levels) == 0:
+        return pd.DataFrame()
+    covers = best[levels] >= daily_kwh
+    covering = covers.any()
+    if covering:
+        levels = levels[covers]
+    else:
+        levels = levels[np.argsort(-best[levels], kind="stable")]
+
+    results, seen = [], set()
+    for b in levels:
+        counts = _reconstruct(batches, b)
+        key = tuple(sorted(counts.items()))
+        if key in seen:
+            continue
+        seen.add(key)
+
+        items = list(counts)
+        n_panels = np.array(list(counts.values()))
+        total_cost = float((front.cost[items] * n_panels).sum())
+        total_kwh = float((energy[items] * n_panels).sum())
+        if covering and total_kwh - energy[items].min() >= daily_kwh:
+            continue  # Oversized: still covers the demand with a panel removed
+
+        rows = catalog.loc[front.rows[items]]
+        results.append({
+            "Configuration": ", ".join(
+                f"{n} × {row['Company']} {row['Panel_Type']} {row['Power_Output (W)']}W"
+                for n, (_, row) in zip(n_panels, rows.iterrows())
+            ),
+            "Panels": int(n_panels.sum()),
+            "Total Cost (₹)": total_cost,
+            "Daily Output (kWh)": total_kwh,
+            "Coverage (%)": min(100.0, 100 * total_kwh / daily_kwh),
+            "₹ per kWh/day": total_cost / total_kwh,
+        })
+        if len(results) == top_k:
+            break
+
+    # Budget levels are rounded to COST_STEP, so order by the exact figures
+    results = pd.DataFrame(results)
+    if covering:
+        return results.sort_values("Total Cost (₹)", ignore_index=True)
+    return results.sort_values("Daily Output (kWh)", ascending=False, ignore_index=True)
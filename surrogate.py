@@ -0,0 +1,259 @@
+"""Closed-form surrogate distilled from the efficiency ensemble.
+
+The ensemble is queried over the training input ranges and a small additive
+model is fitted to its outputs by least squares. The terms are a polynomial in
+temperature, linear in humidity, days since cleaning, panel age and dust
+level, plus the temperature × humidity interaction. The result is a JSON
+artifact of about 1.5 KB. Serving it is a handful of vectorized numpy
+operations and never imports xgboost.
+
+Every model version gets its own surrogate, saved next to the model artifact
+(`publish_model` distils one for each registry version), and records the
+version it was distilled from so it's never served alongside another model.
+
+    python surrogate.py                      # distil the served model
+    python surrogate.py --version 3 --degree 3
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+
+def surrogate_path(model_path):
+    """Where the surrogate of the model artifact at `model_path` is kept."""
+    return os.path.splitext(model_path)[0] + "_surrogate.json"
+
+
+SURROGATE_PATH = surrogate_path("pages/solar_model.pkl")  # Surrogate of the bundled model
+NUMERIC_INPUTS = ["Temperature (°C)", "Humidity (%)", "Days_Since_Cleaning", "Panel_Age (years)"]
+DUST_TERMS = ["Dust_Level_Medium", "Dust_Level_High"]  # Low is the reference level
+
+
+def surrogate_terms(degree=2):
+    return (
+        ["Temperature (°C)"]
+        + [f"Temperature (°C)^{power}" for power in range(2, degree + 1)]
+        + ["Humidity (%)", "Temp_Humidity", "Days_Since_Cleaning", "Panel_Age (years)"]
+        + DUST_TERMS
+    )
+
+
+class Surrogate:
+    """Additive closed-form efficiency model.
+
+    Inputs are clipped to the ranges the ensemble was trained on (trees are
+    flat outside them). Because the model is additive, each term's
+    contribution against the average panel is exact. These are the
+    surrogate's own drivers, not the ensemble's: the fit can share an effect
+    between correlated terms differently from TreeSHAP, so per-driver values
+    (humidity in particular) may differ from the full model's breakdown.
+
+    `model_version` is the registry version the surrogate was distilled from
+    (None for the bundled model).
+    """
+
+    def __init__(self, terms, coefficients, intercept, input_ranges, term_means, drivers,
+                 residual_quantiles=None, quantile_levels=None, metrics=None, model_version=None):
+        self.terms = list(terms)
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.input_ranges = {name: tuple(bounds) for name, bounds in input_ranges.items()}
+        self.term_means = np.asarray(term_means, dtype=np.float64)
+        self.drivers = list(drivers)
+        self.residual_quantiles = None if residual_quantiles is None else np.asarray(residual_quantiles)
+        self.quantile_levels = None if quantile_levels is None else np.asarray(quantile_levels)
+        self.metrics = metrics or {}
+        self.model_version = model_version
+
+    @classmethod
+    def load(cls, path=SURROGATE_PATH):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path=SURROGATE_PATH):
+        artifact = {
+            "terms": self.terms,
+            "coefficients": self.coefficients.tolist(),
+            "intercept": self.intercept,
+            "input_ranges": self.input_ranges,
+            "term_means": self.term_means.tolist(),
+            "drivers": self.drivers,
+            "residual_quantiles": None if self.residual_quantiles is None else self.residual_quantiles.tolist(),
+            "quantile_levels": None if self.quantile_levels is None else self.quantile_levels.tolist(),
+            "metrics": self.metrics,
+            "model_version": self.model_version,
+        }
+        with open(path, "w") as f:
+            json.dump(artifact, f, indent=1)
+
+    def design(self, temp, humidity, dust, days_clean, panel_age):
+        """Term matrix for raw readings (scalars or arrays, broadcast together)."""
+        temp, humidity, dust, days_clean, panel_age = (
+            np.ravel(a) for a in np.broadcast_arrays(temp, humidity, dust, days_clean, panel_age)
+        )
+        raw = dict(zip(NUMERIC_INPUTS, (temp, humidity, days_clean, panel_age)))
+        for name, (low, high) in self.input_ranges.items():
+            raw[name] = np.clip(raw[name].astype(np.float64), low, high)
+        temp = raw["Temperature (°C)"]
+        raw["Temp_Humidity"] = temp * raw["Humidity (%)"] / 100
+        raw["Dust_Level_Medium"] = dust == "Medium"
+        raw["Dust_Level_High"] = dust == "High"
+
+        T = np.empty((len(temp), len(self.terms)))
+        for j, term in enumerate(self.terms):
+            name, _, power = term.partition("^")
+            T[:, j] = raw[name] ** int(power) if power else raw[name]
+        return T
+
+    def predict(self, temp, humidity, dust, days_clean, panel_age):
+        return self.design(temp, humidity, dust, days_clean, panel_age) @ self.coefficients + self.intercept
+
+    def predict_encoded(self, X, feature_columns):
+        """Scores a matrix encoded for the ensemble (see `efficiency_model.build_features`)."""
+        column = {name: j for j, name in enumerate(feature_columns)}
+        dust = np.where(X[:, column["Dust_Level_High"]] > 0, "High",
+                        np.where(X[:, column["Dust_Level_Medium"]] > 0, "Medium", "Low"))
+        return self.predict(*(X[:, column[name]] for name in NUMERIC_INPUTS[:2]), dust,
+                            *(X[:, column[name]] for name in NUMERIC_INPUTS[2:]))
+
+    def explain(self, temp, humidity, dust, days_clean, panel_age):
+        """Returns (efficiency, baseline, driver_names, contributions), one contribution column per driver."""
+        contributions = (self.design(temp, humidity, dust, days_clean, panel_age) - self.term_means) * self.coefficients
+        baseline = float(self.term_means @ self.coefficients + self.intercept)
+        names = sorted(set(self.drivers))
+        drivers = np.stack([
+            contributions[:, [j for j, driver in enumerate(self.drivers) if driver == name]].sum(axis=1)
+            for name in names
+        ], axis=1)
+        return contributions.sum(axis=1) + baseline, baseline, names, drivers
+
+    def quantiles(self, efficiency):
+        """Prediction intervals from the distillation residuals (one column per level)."""
+        if self.residual_quantiles is None:
+            return None
+        return np.atleast_1d(efficiency)[:, None] + self.residual_quantiles[None, :]
+
+
+def surrogate_for(model_path, model_version=None):
+    """The surrogate distilled from this model version, or None if there isn't one."""
+    path = surrogate_path(model_path)
+    if not os.path.exists(path):
+        return None
+    surrogate = Surrogate.load(path)
+    return surrogate if surrogate.model_version == model_version else None
+
+
+def _regression_metrics(predicted, target):
+    error = predicted - target
+    return {
+        "mae": float(np.mean(np.abs(error))),
+        "rmse": float(np.sqrt(np.mean(error ** 2))),
+        "max_abs": float(np.max(np.abs(error))),
+        "r2": float(1 - np.sum(error ** 2) / np.sum((target - target.mean()) ** 2)),
+    }
+
+
+def distill(model, feature_columns, degree=2, n_samples=200_000, seed=0):
+    """Fits a Surrogate to the ensemble's predictions.
+
+    Half of the fitting inputs follow the training distribution and half are
+    uniform over the training ranges, so rare corners (hot, dusty, old panels)
+    are matched as well as typical readings. Accuracy is measured on a fresh
+    draw of the training data, against the ensemble and against the labels.
+    """
+    # Imported here so serving a surrogate never loads xgboost
+    from efficiency_model import (
+        FEATURE_DRIVERS,
+        QUANTILES,
+        build_features,
+        generate_efficiency_data,
+        predict_efficiency,
+    )
+
+    rng = np.random.default_rng(seed)
+    training = generate_efficiency_data(rng)
+    input_ranges = {name: (float(training[name].min()), float(training[name].max())) for name in NUMERIC_INPUTS}
+
+    n_typical = n_samples // 2
+    rows = rng.integers(0, len(training), n_typical)
+    n_uniform = n_samples - n_typical
+    inputs = {
+        name: np.concatenate([training[name].to_numpy()[rows], rng.uniform(low, high, n_uniform)])
+        for name, (low, high) in input_ranges.items()
+    }
+    for name in ["Days_Since_Cleaning", "Panel_Age (years)"]:
+        inputs[name] = np.round(inputs[name])
+    dust = np.concatenate([training["Dust_Level"].to_numpy()[rows], rng.choice(["Low", "Medium", "High"], n_uniform)])
+    args = (inputs["Temperature (°C)"], inputs["Humidity (%)"], dust,
+            inputs["Days_Since_Cleaning"], inputs["Panel_Age (years)"])
+    target = predict_efficiency(model, feature_columns, build_features(*args, feature_columns))
+
+    terms = surrogate_terms(degree)
+    drivers = [FEATURE_DRIVERS.get(term.partition("^")[0], term) for term in terms]
+    surrogate = Surrogate(terms, np.zeros(len(terms)), 0.0, input_ranges, np.zeros(len(terms)), drivers)
+    T = surrogate.design(*args)
+    solution, *_ = np.linalg.lstsq(np.column_stack([np.ones(len(T)), T]), target, rcond=None)
+    surrogate.intercept, surrogate.coefficients = float(solution[0]), solution[1:]
+
+    # Baseline (average panel) and intervals come from the training distribution
+    surrogate.term_means = surrogate.design(
+        training["Temperature (°C)"].to_numpy(), training["Humidity (%)"].to_numpy(), training["Dust_Level"].to_numpy(),
+        training["Days_Since_Cleaning"].to_numpy(), training["Panel_Age (years)"].to_numpy(),
+    ).mean(axis=0)
+    surrogate.quantile_levels = np.array(QUANTILES)
+    surrogate.residual_quantiles = np.quantile(
+        training["Efficiency (%)"].to_numpy() - surrogate.predict(
+            training["Temperature (°C)"].to_numpy(), training["Humidity (%)"].to_numpy(), training["Dust_Level"].to_numpy(),
+            training["Days_Since_Cleaning"].to_numpy(), training["Panel_Age (years)"].to_numpy(),
+        ),
+        QUANTILES,
+    )
+
+    holdout = generate_efficiency_data(rng)
+    holdout_args = tuple(holdout[name].to_numpy() for name in
+                         ["Temperature (°C)", "Humidity (%)", "Dust_Level", "Days_Since_Cleaning", "Panel_Age (years)"])
+    fast = surrogate.predict(*holdout_args)
+    full = predict_efficiency(model, feature_columns, build_features(*holdout_args, feature_columns))
+    truth = holdout["Efficiency (%)"].to_numpy()
+    surrogate.metrics = {
+        "surrogate_vs_ensemble": _regression_metrics(fast, full),
+        "surrogate_vs_truth": _regression_metrics(fast, truth),
+        "ensemble_vs_truth": _regression_metrics(full, truth),
+    }
+    return surrogate
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", type=int, default=None,
+                        help="Registry version to distil (default: the served model)")
+    parser.add_argument("--degree", type=int, default=2, help="Polynomial degree in temperature")
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    from efficiency_model import MODEL_PATH, build_features, load_model, predict_efficiency
+    from model_registry import latest_version, model_path
+
+    version = latest_version() if args.version is None else args.version
+    path = MODEL_PATH if version is None else model_path(version)
+    model, feature_columns = load_model(path)
+    surrogate = distill(model, feature_columns, args.degree, args.samples)
+    surrogate.model_version = version
+    surrogate.save(surrogate_path(path))
+
+    print(f"Saved {len(surrogate.terms)}-term surrogate of {path} to {surrogate_path(path)}")
+    print(f"{'':<24} {'MAE':>6} {'RMSE':>6} {'max |err|':>9} {'R²':>7}")
+    for name, metrics in surrogate.metrics.items():
+        print(f"{name.replace('_', ' '):<24} {metrics['mae']:>6.3f} {metrics['rmse']:>6.3f} "
+              f"{metrics['max_abs']:>9.3f} {metrics['r2']:>7.4f}")
+
+    X = build_features(25.0, 60.0, "Medium", 7, 3, feature_columns)
+    for label, score in [("ensemble", lambda: predict_efficiency(model, feature_columns, X)),
+                         ("surrogate", lambda: surrogate.predict(25.0, 60.0, "Medium", 7, 3))]:
+        start = time.perf_counter()
+        for _ in range(1000):
+            score()
+        print(f"{label:<10} single-reading latency: {(time.perf_counter() - start) * 1e3:.1f} µs")
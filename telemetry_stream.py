@@ -0,0 +1,240 @@
+"""Streaming ingestion of site sensor logs.
+
+Readings are parsed in fixed-size chunks (files or stdin), scored against the
+efficiency model in one batch per chunk and folded into per-site ring buffers
+and incremental feature histograms, so memory stays bounded no matter how long
+the stream runs.
+
+    python telemetry_stream.py logs/*.csv
+    cat readings.csv | python telemetry_stream.py -
+    python telemetry_stream.py --surrogate logs/*.csv   # closed-form scorer
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from efficiency_model import (
+    READING_COLUMNS,
+    encode_readings,
+    generate_efficiency_data,
+    load_model,
+    predict_efficiency,
+)
+from model_registry import latest_model_path, latest_version
+from surrogate import surrogate_for
+
+NUMERIC_FEATURES = ["Temperature (°C)", "Humidity (%)", "Days_Since_Cleaning", "Panel_Age (years)"]
+DUST_LEVELS = ["Low", "Medium", "High"]
+
+PSI_DRIFT_THRESHOLD = 0.2  # > 0.2 is the usual "significant shift" cut-off
+KS_DRIFT_THRESHOLD = 0.1
+ANOMALY_RESIDUAL = 5.0  # Rolling shortfall (efficiency points) that flags a site
+MIN_ANOMALY_READINGS = 5
+
+
+def read_telemetry(sources, chunksize=50_000):
+    """Yields DataFrame chunks from CSV files, or stdin for "-"."""
+    for source in sources:
+        handle = sys.stdin if source == "-" else source
+        yield from pd.read_csv(handle, chunksize=chunksize)
+
+
+class SiteRollingWindow:
+    """Fixed-size ring buffer of the latest readings for every site."""
+
+    def __init__(self, window=96, initial_sites=1024):
+        self.window = window
+        self.buffer = np.full((initial_sites, window), np.nan)
+        self.head = np.zeros(initial_sites, dtype=np.int64)
+        self.count = np.zeros(initial_sites, dtype=np.int64)
+
+    def _grow(self, n_sites):
+        if n_sites <= len(self.head):
+            return
+        extra = max(n_sites, 2 * len(self.head)) - len(self.head)
+        self.buffer = np.vstack([self.buffer, np.full((extra, self.window), np.nan)])
+        self.head = np.concatenate([self.head, np.zeros(extra, dtype=np.int64)])
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+
+    def update(self, sites, values):
+        """Appends `values` (in arrival order) to the buffers of `sites`."""
+        if len(sites) == 0:
+            return
+        self._grow(sites.max() + 1)
+        order = np.argsort(sites, kind="stable")
+        sites, values = sites[order], values[order]
+
+        # Position of every reading within its site's run in this chunk
+        starts = np.flatnonzero(np.r_[True, sites[1:] != sites[:-1]])
+        run_lengths = np.diff(np.r_[starts, len(sites)])
+        rank = np.arange(len(sites)) - np.repeat(starts, run_lengths)
+
+        # Only the last `window` readings of each run survive; skip the rest
+        keep = rank >= np.repeat(run_lengths, run_lengths) - self.window
+        slot = (self.head[sites[keep]] + rank[keep]) % self.window
+        self.buffer[sites[keep], slot] = values[keep]
+
+        run_sites = sites[starts]
+        self.head[run_sites] = (self.head[run_sites] + run_lengths) % self.window
+        self.count[run_sites] = np.minimum(self.count[run_sites] + run_lengths, self.window)
+
+    def mean(self, n_sites):
+        with np.errstate(invalid="ignore"):
+            return np.nanmean(self.buffer[:n_sites], axis=1)
+
+
+class FeatureHistogram:
+    """Incremental histogram of one feature against a reference distribution."""
+
+    def __init__(self, reference, bins=20, categories=None):
+        self.categories = categories
+        if categories is None:
+            # Equal-mass bins over the reference; outer bins catch out-of-range values
+            self.edges = np.unique(np.quantile(reference, np.linspace(0, 1, bins + 1))[1:-1])
+        self.reference = self._bin_counts(reference)
+        self.counts = np.zeros_like(self.reference)
+
+    def _bin_counts(self, values):
+        if self.categories is None:
+            index = np.searchsorted(self.edges, values, side="right")
+            return np.bincount(index, minlength=len(self.edges) + 1).astype(np.float64)
+        index = pd.Categorical(values, categories=self.categories).codes
+        return np.bincount(index[index >= 0], minlength=len(self.categories)).astype(np.float64)
+
+    def update(self, values):
+        self.counts += self._bin_counts(values)
+
+    def psi(self):
+        expected = np.maximum(self.reference / self.reference.sum(), 1e-4)
+        actual = np.maximum(self.counts / max(self.counts.sum(), 1), 1e-4)
+        return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+    def ks(self):
+        # Largest gap between the binned CDFs
+        expected = np.cumsum(self.reference) / self.reference.sum()
+        actual = np.cumsum(self.counts) / max(self.counts.sum(), 1)
+        return float(np.max(np.abs(actual - expected)))
+
+
+def reference_histograms(bins=20):
+    """Histograms seeded with the training distribution from generate_efficiency_data."""
+    training = generate_efficiency_data()
+    histograms = {feature: FeatureHistogram(training[feature].to_numpy(), bins) for feature in NUMERIC_FEATURES}
+    histograms["Dust_Level"] = FeatureHistogram(training["Dust_Level"].to_numpy(), categories=DUST_LEVELS)
+    return histograms
+
+
+class TelemetryMonitor:
+    """Consumes telemetry chunks and tracks drift and per-site anomalies.
+
+    `scorer` maps an encoded feature matrix to predicted efficiency (see
+    `model_scorer`).
+    """
+
+    def __init__(self, feature_columns, scorer, histograms=None, window=96):
+        self.feature_columns = feature_columns
+        self.scorer = scorer
+        self.histograms = histograms if histograms is not None else reference_histograms()
+        self.site_ids = {}
+        self.predicted = SiteRollingWindow(window)
+        self.residual = SiteRollingWindow(window)
+        self.readings = 0
+
+    def _site_codes(self, site_column):
+        codes, uniques = pd.factorize(site_column)
+        for site in uniques:
+            self.site_ids.setdefault(site, len(self.site_ids))
+        lookup = np.array([self.site_ids[site] for site in uniques], dtype=np.int64)
+        return lookup[codes]
+
+    def process(self, chunk):
+        """Folds one chunk of readings into the monitor.
+
+        Raises ValueError naming the `READING_COLUMNS` the chunk is missing.
+        """
+        missing = [column for column in READING_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Sensor log is missing required columns: {', '.join(missing)}")
+        chunk = chunk.dropna(subset=READING_COLUMNS)
+        for feature, histogram in self.histograms.items():
+            histogram.update(chunk[feature].to_numpy())
+
+        predicted = self.scorer(encode_readings(chunk, self.feature_columns))
+
+        sites = self._site_codes(chunk["Site_ID"] if "Site_ID" in chunk.columns else np.zeros(len(chunk)))
+        self.predicted.update(sites, predicted)
+        if "Efficiency (%)" in chunk.columns:
+            self.residual.update(sites, chunk["Efficiency (%)"].to_numpy() - predicted)
+        self.readings += len(chunk)
+
+    def run(self, chunks):
+        for chunk in chunks:
+            self.process(chunk)
+        return self
+
+    def drift_report(self):
+        rows = []
+        for feature, histogram in self.histograms.items():
+            psi, ks = histogram.psi(), histogram.ks()
+            rows.append({
+                "Feature": feature,
+                "PSI": psi,
+                "KS": ks,
+                "Drifted": psi > PSI_DRIFT_THRESHOLD or ks > KS_DRIFT_THRESHOLD,
+            })
+        return pd.DataFrame(rows)
+
+    def site_report(self):
+        n_sites = len(self.site_ids)
+        report = pd.DataFrame({
+            "Site_ID": list(self.site_ids),
+            "Window Readings": self.predicted.count[:n_sites],
+            "Predicted Efficiency (%)": self.predicted.mean(n_sites),
+            "Rolling Residual (%)": self.residual.mean(n_sites),
+        })
+        report["Anomaly"] = (
+            (report["Rolling Residual (%)"] < -ANOMALY_RESIDUAL)
+            & (self.residual.count[:n_sites] >= MIN_ANOMALY_READINGS)
+        )
+        return report
+
+
+def model_scorer(model, feature_columns):
+    return lambda X: predict_efficiency(model, feature_columns, X)
+
+
+def surrogate_scorer(surrogate, feature_columns):
+    return lambda X: surrogate.predict_encoded(X, feature_columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="+", help="CSV files, or - for stdin")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--surrogate", action="store_true",
+                        help="Score with the served model's distilled surrogate instead of the model")
+    args = parser.parse_args()
+
+    path = latest_model_path()
+    model, feature_columns = load_model(path)
+    if args.surrogate:
+        surrogate = surrogate_for(path, latest_version())
+        if surrogate is None:
+            parser.error(f"no surrogate distilled from {path}; run python surrogate.py")
+        scorer = surrogate_scorer(surrogate, feature_columns)
+    else:
+        scorer = model_scorer(model, feature_columns)
+    monitor = TelemetryMonitor(feature_columns, scorer)
+    try:
+        monitor.run(read_telemetry(args.sources, args.chunksize))
+    except ValueError as e:
+        sys.exit(str(e))
+
+    print(f"Processed {monitor.readings:,} readings from {len(monitor.site_ids):,} sites")
+    print(monitor.drift_report().to_string(index=False))
+    anomalies = monitor.site_report().query("Anomaly")
+    print(f"{len(anomalies)} site(s) flagged")
+    if not anomalies.empty:
+        print(anomalies.to_string(index=False))